@@ -1,101 +1,25 @@
-import os
 import time
-import requests
 import re
-import google.generativeai as genai
-from bs4 import BeautifulSoup
 from typing import Optional, Dict, Tuple, List
-from dotenv import load_dotenv
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import random
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
 import platform
-import undetected_chromedriver as uc
-import pyperclip
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-import json
+import threading
+import queue
+import argparse
+
+from naver_core import NaverClient
 
-class NaverBot:
-    def __init__(self):
-        """NaverBot 초기화"""
-        load_dotenv()
-        self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.cookies = {}
-        self.headers = {
-            'accept': '*/*',
-            'accept-encoding': 'gzip, deflate, br, zstd',
-            'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-        }
-        self.driver = None
-        
-        # Gemini API 설정
-        genai.configure(api_key=self.gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
-        
-        # 댓글 템플릿
-        self.comment_templates = [
-            "좋은 글 잘 읽었습니다. 감사합니다!",
-            "유익한 정보 감사합니다. 잘 보고 갑니다!",
-            "정말 도움이 되는 글이네요. 공감합니다!",
-            "글 잘 읽었습니다. 다음 글도 기대됩니다!",
-            "좋은 정보 공유해주셔서 감사합니다!"
-        ]
-        self.current_template_index = 0
-        
-        # 로그인 정보 및 페이지 수 입력
-        print("\n=== 네이버 로그인 정보 입력 ===")
-        self.id = input("네이버 아이디를 입력하세요: ")
-        self.pw = input("네이버 비밀번호를 입력하세요: ")
-        self.nickname = input("확인할 닉네임을 입력하세요: ")
-        
-        # 댓글 생성 방식 선택
-        while True:
-            try:
-                print("\n=== 댓글 생성 방식 선택 ===")
-                print("1. 템플릿 댓글 사용 (미리 정의된 댓글을 순서대로 사용)")
-                print("2. Gemini AI 사용 (블로그 내용을 분석하여 댓글 생성)")
-                comment_type = int(input("댓글 생성 방식을 선택하세요 (1 또는 2): "))
-                if comment_type in [1, 2]:
-                    self.use_gemini = (comment_type == 2)
-                    break
-                else:
-                    print("1 또는 2를 입력해주세요.")
-            except ValueError:
-                print("올바른 숫자를 입력해주세요.")
-        
-        # 페이지 수 입력
-        while True:
-            try:
-                self.max_pages = int(input("몇 페이지까지 처리할까요? (1-10): "))
-                if 1 <= self.max_pages <= 10:
-                    break
-                else:
-                    print("1에서 10 사이의 숫자를 입력해주세요.")
-            except ValueError:
-                print("올바른 숫자를 입력해주세요.")
-        print("===========================\n")
-        
-        # 웹드라이버 초기화 및 로그인
-        self.initialize_driver()
-        if not self.login():
-            print("로그인에 실패했습니다. 프로그램을 종료합니다.")
-            if self.driver:
-                self.driver.quit()
-            return
-            
-        # 페이지 처리 시작
-        self.process_pages()
+
+class NaverBot(NaverClient):
+    def __init__(self, id: str, pw: str, nickname: str, use_gemini: bool, max_pages: int, cbox_token_ttl: Optional[float] = None, profile: bool = False, resume: bool = False):
+        """NaverBot 초기화, 입력값은 run()에서 받아 전달합니다."""
+        super().__init__(id, pw, nickname, use_gemini, 1, max_pages, cbox_token_ttl=cbox_token_ttl, profile=profile, resume=resume)
 
     def initialize_driver(self):
         """웹드라이버 초기화"""
+        import undetected_chromedriver as uc
+        
         if self.driver:
             return
             
@@ -127,12 +51,44 @@ class NaverBot:
             '''
         })
 
+    def ensure_login(self) -> bool:
+        """저장된 세션이 유효하면 재사용하고, 아니면 브라우저로 로그인합니다."""
+        if self.restore_session():
+            print("저장된 로그인 세션이 유효하여 브라우저 로그인을 건너뜁니다.")
+            if self.browserless:
+                print("브라우저 없이 실행합니다.")
+            else:
+                self.initialize_driver()
+                self.copy_cookies_to_driver()
+            return True
+            
+        self.initialize_driver()
+        if not self.login():
+            return False
+        self.save_session()
+        return True
+
+    def copy_cookies_to_driver(self) -> None:
+        """복원한 세션 쿠키를 웹드라이버에도 넣어 브라우저 경로에서도 로그인 상태를 유지합니다."""
+        if not self.driver:
+            return
+        try:
+            self.driver.get("https://www.naver.com")
+            for cookie in self.session.cookies:
+                if cookie.domain.endswith('naver.com'):
+                    self.driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path})
+        except Exception as e:
+            print(f"웹드라이버 쿠키 설정 실패: {str(e)}")
+
     def login(self):
         """네이버 로그인"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             print("3. 네이버 로그인 페이지 접속...")
             self.driver.get("https://nid.naver.com/nidlogin.login")
-            time.sleep(random.uniform(2, 4))
             
             print("4. 로그인 정보 입력...")
             id_input = WebDriverWait(self.driver, 10).until(
@@ -153,12 +109,10 @@ class NaverBot:
             )
             time.sleep(random.uniform(1, 2))
             login_button.click()
-            time.sleep(random.uniform(3, 5))
             
-            # 로그인 성공 확인
+            # 로그인 성공 확인 (고정 대기 대신 로그인 쿠키가 생기는 시점까지 대기)
             try:
-                current_title = self.driver.title
-                if current_title and "로그인" in current_title:
+                if not self.wait_for_login_cookie(15):
                     print("\n[알림] 캡차나 보안 문제가 발생했습니다.")
                     print("브라우저에서 직접 로그인을 진행해주세요.")
                     print("로그인이 완료되면 아무 키나 눌러주세요...")
@@ -181,470 +135,168 @@ class NaverBot:
                     self.driver.quit()
                     return False
                     
+            self.sync_cookies()
             return True
             
         except Exception as e:
             print(f"로그인 중 오류 발생: {str(e)}")
             return False
 
-    def wait_random_time(self, min_seconds: float, max_seconds: float):
-        """랜덤 대기 시간 설정"""
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    def wait_for_login_cookie(self, timeout: float) -> bool:
+        """로그인 쿠키(NID_AUT)가 생길 때까지 기다립니다."""
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.3).until(lambda driver: driver.get_cookie('NID_AUT'))
+            return True
+        except TimeoutException:
+            return False
+            
+    def wait_for_stable_count(self, container, selector: str, timeout: float) -> int:
+        """컨테이너 안의 요소 개수가 더 이상 늘지 않을 때까지 기다린 뒤 개수를 돌려줍니다."""
+        deadline = time.monotonic() + timeout
+        last_count, stable_polls = -1, 0
+        while time.monotonic() < deadline:
+            count = self.driver.execute_script("return arguments[0].querySelectorAll(arguments[1]).length;", container, selector)
+            if count and count == last_count:
+                stable_polls += 1
+                if stable_polls >= 2:
+                    break
+            else:
+                stable_polls = 0
+            last_count = count
+            time.sleep(0.3)
+        return max(last_count, 0)
 
     def process_pages(self) -> None:
-        """프로그램 실행"""
+        """프로그램 실행
+        
+        이웃새글 수집(discover_posts 스레드) → 읽기 작업(enrich_executor: blogNo, 댓글 확인, 본문, Gemini 댓글)
+        → 좋아요/댓글 작성(이 스레드) 순서의 파이프라인으로 처리합니다. 읽기 작업은 대기 시간과 겹쳐 진행되고,
+        실제 좋아요/댓글 작성은 이 스레드에서만 기존 대기 시간대로 이루어집니다.
+        """
+        posts_queue = queue.Queue(maxsize=self.PIPELINE_DEPTH)
+        stop_event = threading.Event()
+        discovery = None
         try:
+            if self.profiler:
+                self.profiler.start()
+                
+            if self.resume:
+                if self.checkpoint.load():
+                    print(f"체크포인트에서 이어서 실행합니다. ({self.checkpoint.discovered_page}페이지까지 수집됨, 남은 포스트 {len(self.checkpoint.pending)}개, 마지막으로 처리한 포스트: {self.checkpoint.last_log_no})")
+                else:
+                    print("이어서 실행할 체크포인트가 없어 처음부터 실행합니다.")
+                    
             total_processed = 0
+            total_skipped = 0
+            current_page = None
+            
+            self.enrich_executor = ThreadPoolExecutor(max_workers=self.ENRICH_WORKERS, thread_name_prefix='enrich')
+            discovery = threading.Thread(target=self.profiled(self.discover_posts), args=(posts_queue, stop_event), name='discovery', daemon=True)
+            discovery.start()
             
-            for page in range(1, self.max_pages + 1):
-                print(f"\n=== {page}페이지 처리 시작 ===")
+            while True:
+                item = posts_queue.get()
+                if item is None or self.session_expired:
+                    # 수집 종료, 또는 세션이 만료되고 다시 로그인하지 못함
+                    break
+                    
+                if 'page_done' in item:
+                    page = item['page_done']
+                    print(f"\n{page}페이지 처리가 완료되었습니다.")
+                    if self.profiler:
+                        self.profiler.page_done(page)
+                        
+                    # 다음 페이지 처리 전 대기
+                    if page < self.end_page:
+                        print(f"\n{page+1}페이지 처리 전 대기 중...")
+                        self.wait_random_time(5, 7)
+                    continue
+                    
+                if item['page'] != current_page:
+                    current_page = item['page']
+                    print(f"\n=== {current_page}페이지 처리 시작 ===")
+                    
+                blog_id, blog_post_id = item['blog_id'], item['blog_post_id']
+                # 수집 때 읽은 장부/좋아요 상태/댓글 확인은 그 사이 처리한 결과를 모르므로 처리 직전에 장부를 다시 읽음
+                record = self.ledger.get(blog_id, blog_post_id) or {}
                 
-                # 이웃 블로그 목록 가져오기
-                neighbor_blogs = self.get_neighbor_blogs(page)
-                if not neighbor_blogs:
-                    print(f"{page}페이지의 이웃 블로그 목록을 가져오는데 실패했습니다.")
-                    break  # 실패하면 더 이상 진행하지 않음
+                # 이전 실행에서 이미 처리한 포스트는 네트워크 요청 없이 건너뜀
+                if record.get('liked_at') and record.get('commented_at'):
+                    print(f"\n건너뜀: {blog_id}의 포스트 {blog_post_id}는 이미 처리되었습니다.")
+                    total_skipped += 1
+                    self.mark_checkpoint_done(item)
+                    continue
+                    
+                print(f"\n처리 중: {blog_id}의 포스트 {blog_post_id}")
+                post_started = time.perf_counter()
                 
-                print(f"총 {len(neighbor_blogs)}개의 이웃 블로그를 찾았습니다.")
+                # 좋아요
+                if not record.get('liked_at'):
+                    like_state = item['like_state']
+                    self.like_post(blog_id, blog_post_id, like_state)
+                    # 이미 공감한 포스트는 좋아요 요청을 보내지 않으므로 대기도 생략
+                    if not (like_state and like_state['is_reacted']):
+                        self.wait_random_time(2, 4)
                 
-                # 각 블로그 포스트에 대해 처리
-                for blog_id, blog_post_id in neighbor_blogs:
-                    print(f"\n처리 중: {blog_id}의 포스트 {blog_post_id}")
-                    
-                    # 좋아요
-                    self.like_post(blog_id, blog_post_id)
-                    self.wait_random_time(2, 4)
-                    
-                    # 댓글 작성
+                # 댓글 작성, 미리 준비한 결과를 기다려 사용하고 실패했으면 write_comment가 직접 확인/생성
+                if not (self.ledger.get(blog_id, blog_post_id) or {}).get('commented_at'):
                     try:
-                        self.write_comment(blog_id, blog_post_id)
+                        prepared = None
+                        if item['prepared']:
+                            try:
+                                prepared = item['prepared'].result()
+                            except Exception as e:
+                                print(f"미리 준비한 댓글을 가져오지 못했습니다: {str(e)}")
+                        self.write_comment(blog_id, blog_post_id, prepared)
                     except Exception as e:
                         print(f"댓글 작성 중 오류 발생: {str(e)}")
-                        
-                    total_processed += 1
-                    self.wait_random_time(3, 5)
-                
-                print(f"\n{page}페이지 처리가 완료되었습니다.")
-                
-                # 페이지가 1이면 여기서 종료
-                if self.max_pages == 1:
-                    break
-                
-                # 다음 페이지 처리 전 대기
-                if page < self.max_pages:
-                    print(f"\n{page+1}페이지 처리 전 대기 중...")
-                    self.wait_random_time(5, 7)
+                    
+                total_processed += 1
+                self.metrics.add_timing('post', time.perf_counter() - post_started)
+                self.mark_checkpoint_done(item)
+                self.wait_random_time(3, 5)
             
-            print(f"\n모든 처리가 완료되었습니다. 총 {total_processed}개의 포스트를 처리했습니다.")
+            if self.session_expired:
+                print(f"\n작업이 중지되었습니다. 중지 전까지 {total_processed}개의 포스트를 처리했습니다. (이미 처리되어 건너뛴 포스트: {total_skipped}개)")
+            else:
+                print(f"\n모든 처리가 완료되었습니다. 총 {total_processed}개의 포스트를 처리했습니다. (이미 처리되어 건너뛴 포스트: {total_skipped}개)")
             
         except Exception as e:
             print(f"페이지 처리 중 오류 발생: {str(e)}")
         finally:
-            if self.driver:
-                self.driver.quit()
-                print("\n웹드라이버가 종료되었습니다.")
-
-    def get_cbox_token(self, blog_id: str, blog_post_id: str) -> Optional[str]:
-        """댓글 작성을 위한 cbox_token을 가져옵니다."""
-        try:
-            url = "https://apis.naver.com/commentBox/cbox/web_naver_token_jsonp.json"
-            params = {
-                'ticket': 'blog',
-                'templateId': 'default',
-                'pool': 'blogid',
-                'lang': 'ko',
-                'country': '',
-                'objectId': f'154352947_201_{blog_post_id}',
-                '_cv': '20240923174033',
-                'categoryId': '',
-                'groupId': '154352947',
-            }
-            
-            headers = {
-                'accept': '*/*',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': 'https://m.blog.naver.com/CommentList.naver',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'script',
-                'sec-fetch-mode': 'no-cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-            
-            response = session.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            
-            return response.json()['result']['cbox_token']
-            
-        except Exception as e:
-            print(f"cbox_token 가져오기 실패: {str(e)}")
-            return None
-            
-    def get_blog_no(self, blog_id: str, blog_post_id: str) -> Optional[str]:
-        """블로그 번호를 가져옵니다."""
-        try:
-            url = f'https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={blog_post_id}'
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            content = response.content.decode('utf-8')
-            match = re.search(r"blogNo\s*=\s*'(\d+)'", content)
-            
-            return match.group(1) if match else None
-            
-        except Exception as e:
-            print(f"블로그 번호 가져오기 실패: {str(e)}")
-            return None
-            
-    def get_blog_content(self, blog_id: str, blog_post_id: str) -> Optional[str]:
-        """블로그 포스트의 내용을 가져옵니다."""
-        try:
-            url = f'https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={blog_post_id}'
-            response = requests.get(url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 블로그 내용 추출
-            content = soup.find('div', {'class': 'se-main-container'})
-            if not content:
-                content = soup.find('div', {'id': 'postViewArea'})
-                
-            if content:
-                # 텍스트만 추출
-                text = content.get_text(separator=' ', strip=True)
-                return text[:2000]  # Gemini API 토큰 제한을 고려하여 내용 제한
-            return None
-            
-        except Exception as e:
-            print(f"블로그 내용 가져오기 실패: {str(e)}")
-            return None
-            
-    def generate_comment_with_gemini(self, blog_content: str) -> Optional[str]:
-        """Gemini API를 사용하여 블로그 내용에 맞는 댓글을 생성합니다."""
-        try:
-            prompt = f"""
-            다음 블로그 글을 읽고 적절한 댓글을 작성해주세요.
-            댓글은 1-2문장으로 간단하게 작성하고, 블로그 내용을 잘 이해했다는 것을 보여주면서
-            긍정적이고 격려하는 톤으로 작성해주세요.
-            
-            블로그 내용:
-            {blog_content}
-            """
-            
-            response = self.model.generate_content(prompt)
-            return response.text
-            
-        except Exception as e:
-            print(f"Gemini 댓글 생성 실패: {str(e)}")
-            return None
-            
-    def has_commented(self, blog_id: str, blog_post_id: str) -> bool:
-        """이미 댓글을 작성했는지 확인합니다."""
-        try:
-            # 블로그 번호 가져오기
-            blog_Num = self.get_blog_no(blog_id, blog_post_id)
-            if not blog_Num:
-                print("블로그 번호를 가져오지 못했습니다.")
-                return False
+            stop_event.set()
+            if discovery:
+                discovery.join(timeout=5)
+            if self.enrich_executor:
+                self.enrich_executor.shutdown(wait=False, cancel_futures=True)
+                self.enrich_executor = None
                 
-            url = f"https://apis.naver.com/commentBox/cbox/web_naver_list_json.json"
-            params = {
-                'ticket': 'blog',
-                'templateId': 'default',
-                'pool': 'blogid',
-                'lang': 'ko',
-                'country': '',
-                'objectId': f'{blog_Num}_201_{blog_post_id}',
-                'categoryId': '',
-                'pageSize': '100',
-                'indexSize': '10',
-                'groupId': blog_Num,
-                'listType': 'OBJECT',
-                'pageType': 'more',
-                'objectUrl': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                '_cv': str(int(time.time() * 1000))
-            }
-            
-            headers = {
-                'accept': 'application/json, text/javascript, */*; q=0.01',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
+            # 끝까지 처리했으면 체크포인트를 지우고, 중단되었으면 그 사이 준비된 댓글까지 저장
+            if self.checkpoint.is_complete(self.end_page):
+                self.checkpoint.remove()
+            elif self.checkpoint.save():
+                print("진행 상황을 저장했습니다. --resume으로 실행하면 중단된 위치부터 처리합니다.")
                 
-            response = session.get(url, params=params, headers=headers)
-            result = response.json()
+            if self.profiler:
+                self.profiler.stop()
+                print(f"프로파일 결과를 저장했습니다: {self.profiler.directory}")
+            self.write_metrics()
             
-            if 'result' in result and 'commentList' in result['result']:
-                for comment in result['result']['commentList']:
-                    if comment.get('userName') == self.nickname:
-                        print(f"이미 '{self.nickname}' 님이 댓글을 작성하셨습니다.")
-                        return True
-                            
-            return False
-            
-        except Exception as e:
-            print(f"댓글 목록 확인 중 오류 발생: {str(e)}")
-            return False
+            # 실행 중 갱신된 쿠키까지 저장
+            self.save_session()
+            if self.driver:
+                self.driver.quit()
+                print("\n웹드라이버가 종료되었습니다.")
 
-    def write_comment(self, blog_id: str, blog_post_id: str) -> bool:
-        """블로그에 댓글을 작성합니다."""
-        try:
-            # 이미 댓글을 작성했는지 확인
-            if self.has_commented(blog_id, blog_post_id):
-                print("이미 댓글을 작성한 포스트입니다.")
-                return False
-                
-            # 댓글 내용 생성
-            if self.use_gemini:
-                # Gemini API로 댓글 생성
-                blog_content = self.get_blog_content(blog_id, blog_post_id)
-                if not blog_content:
-                    print("블로그 내용을 가져오지 못했습니다.")
-                    return False
-                    
-                comment_content = self.generate_comment_with_gemini(blog_content)
-                if not comment_content:
-                    print("댓글 생성에 실패했습니다.")
-                    return False
-            else:
-                # 템플릿 댓글 사용
-                comment_content = self.comment_templates[self.current_template_index]
-                self.current_template_index = (self.current_template_index + 1) % len(self.comment_templates)
-                
-            # 댓글 작성 API 호출
-            blog_Num = self.get_blog_no(blog_id, blog_post_id)
-            if not blog_Num:
-                print("블로그 번호를 가져오지 못했습니다.")
-                return False
-                
-            cbox_token = self.get_cbox_token(blog_id, blog_post_id)
-            if not cbox_token:
-                print("cbox_token을 가져오지 못했습니다.")
-                return False
-                
-            url = "https://apis.naver.com/commentBox/cbox/web_naver_create_json.json"
-            params = {
-                'ticket': 'blog',
-                'templateId': 'default',
-                'pool': 'blogid',
-                '_cv': str(int(time.time() * 1000))
-            }
-            
-            data = {
-                'lang': 'ko',
-                'country': '',
-                'objectId': f'{blog_Num}_201_{blog_post_id}',
-                'categoryId': '',
-                'pageSize': '100',
-                'indexSize': '10',
-                'groupId': f'{blog_Num}',
-                'listType': 'OBJECT',
-                'pageType': 'more',
-                'objectUrl': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                'contents': comment_content,
-                'userType': '',
-                'pick': 'false',
-                'manager': 'false',
-                'score': '0',
-                'sort': 'NEW',
-                'secret': 'false',
-                'refresh': 'false',
-                'imageCount': '0',
-                'commentType': 'txt',
-                'validateBanWords': 'false',
-                'cbox_token': cbox_token
-            }
-            
-            headers = {
-                'accept': 'application/json, text/javascript, */*; q=0.01',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'origin': 'https://m.blog.naver.com',
-                'referer': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
-                'content-type': 'application/x-www-form-urlencoded'
-            }
-            
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-                
-            response = session.post(url, params=params, headers=headers, data=data)
-            result = response.json()
-            
-            if 'success' in result and result['success']:
-                print("댓글 작성 성공!")
-                return True
-            else:
-                print("댓글 작성 실패")
-                return False
-                
-        except Exception as e:
-            print(f"댓글 작성 중 오류 발생: {str(e)}")
-            return False
-            
-    def get_like_tokens(self, blog_id: str, blog_post_id: str) -> Tuple[Optional[str], Optional[str]]:
-        """좋아요를 위한 timestamp와 guestToken을 가져옵니다."""
-        try:
-            url = "https://apis.naver.com/blogserver/like/v1/search/contents"
-            params = {
-                'suppress_response_codes': 'true',
-                'pool': 'blogid',
-                'q': f'BLOG[{blog_id}_{blog_post_id}]',
-                'isDuplication': 'true',
-                'cssIds': 'BASIC_MOBILE,BLOG_MOBILE',
-            }
-            
-            response = requests.get(url, params=params, headers=self.headers, cookies=self.cookies)
-            response.raise_for_status()
-            
-            data = response.json()
-            return data.get('timestamp'), data.get('guestToken')
-            
-        except Exception as e:
-            print(f"좋아요 토큰 가져오기 실패: {str(e)}")
-            return None, None
-            
-    def like_post(self, blog_id: str, blog_post_id: str) -> bool:
-        """블로그 포스트에 좋아요를 누릅니다."""
-        try:
-            # timestamp와 guestToken 가져오기
-            token_url = "https://apis.naver.com/blogserver/like/v1/search/contents"
-            token_params = {
-                'suppress_response_codes': 'true',
-                'pool': 'blogid',
-                'q': f'BLOG[{blog_id}_{blog_post_id}]',
-                'isDuplication': 'true',
-                'cssIds': 'BASIC_MOBILE,BLOG_MOBILE',
-            }
-            
-            token_headers = {
-                'accept': '*/*',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': 'https://m.blog.naver.com/PostView.naver',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'script',
-                'sec-fetch-mode': 'no-cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            
-            # 세션 생성 및 쿠키 설정
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-            
-            # timestamp와 guestToken 가져오기
-            print("\ntimestamp와 guestToken 가져오는 중...")
-            token_response = session.get(token_url, params=token_params, headers=token_headers)
-            token_result = token_response.json()
-            
-            timestamp = token_result.get('timestamp')
-            guest_token = token_result.get('guestToken')
-            
-            if not timestamp or not guest_token:
-                print("timestamp 또는 guestToken을 가져오지 못했습니다.")
-                return False
-            
-            # 좋아요 API URL
-            url = f"https://apis.naver.com/blogserver/like/v1/services/BLOG/contents/{blog_id}_{blog_post_id}"
-            print(f"좋아요 API URL: {url}")
-            
-            # 요청 파라미터
-            params = {
-                'suppress_response_codes': 'true',
-                '_method': 'POST',
-                'pool': 'blogid',
-                'displayId': 'BLOG',
-                'reactionType': 'like',
-                'categoryId': 'post',
-                'guestToken': guest_token,
-                'timestamp': timestamp,
-                '_ch': 'mbw',
-                'isDuplication': 'true',
-                'lang': 'ko',
-                'countType': 'DEFAULT',
-                'count': '1',
-                'history': '',
-                'runtimeStatus': '',
-                'isPostTimeline': 'false',
-                '_': timestamp
-            }
-            
-            # 요청 헤더
-            headers = {
-                'accept': '*/*',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': 'https://m.blog.naver.com/PostView.naver',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'script',
-                'sec-fetch-mode': 'no-cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            
-            # 좋아요 요청 보내기
-            print("\n좋아요 요청 전송 중...")
-            response = session.get(url, params=params, headers=headers)
-            print(f"응답 상태 코드: {response.status_code}")
-            
-            # 응답 확인
-            result = response.json()
-            
-            # 응답 형식 확인
-            if 'statusCode' in result:
-                if result['statusCode'] == 200 or (result['statusCode'] == 409 and result['message'] == '이미 공감한 컨텐츠입니다.'):
-                    print(f"이미 이 포스트에 공감을 하셨습니다.")
-                    return True
-                else:
-                    print(f"좋아요 실패: {result.get('message', '알 수 없는 오류')}")
-                    return False
-            elif 'isReacted' in result and result['isReacted']:
-                print(f"좋아요 성공! 현재 좋아요 수: {result['count']}")
-                return True
-            else:
-                print("좋아요 실패: 응답 형식이 예상과 다릅니다.")
-                return False
-            
-        except Exception as e:
-            print(f"좋아요 실패: {str(e)}")
-            print(f"상세 오류: {e.__class__.__name__}")
-            return False
-            
     def copy_paste_text(self, element, text):
         """OS에 따라 다른 단축키로 텍스트를 복사/붙여넣기하는 함수"""
+        import pyperclip
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.common.keys import Keys
+        
         pyperclip.copy(text)
         time.sleep(0.5)
         
@@ -662,13 +314,22 @@ class NaverBot:
         
         time.sleep(0.5)
 
-    def get_neighbor_blogs(self, page: int = 1) -> List[Tuple[str, str]]:
-        """이웃새글 목록을 가져옵니다."""
+    def get_neighbor_blogs_from_browser(self, page: int = 1) -> List[Tuple[str, str]]:
+        """이웃새글 목록을 브라우저 화면에서 가져옵니다."""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        if not self.driver:
+            # HTTP 피드를 쓰지 않거나(use_http_feed) 브라우저 모드에서 피드 조회가 실패했을 때만 크롬을 띄움
+            print("브라우저로 이웃새글을 가져오기 위해 웹드라이버를 시작합니다.")
+            self.initialize_driver()
+            self.copy_cookies_to_driver()
+            
         try:
             print(f"6. 네이버 블로그 홈페이지로 이동 (페이지 {page})...")
             # 네이버 블로그 홈페이지로 직접 이동 (페이지 번호 포함)
-            self.driver.get(f"https://section.blog.naver.com/BlogHome.naver?directoryNo=0&currentPage={page}&groupId=0")
-            time.sleep(5)  # 페이지 로딩 대기
+            self.driver.get(f"{self.SECTION_URL}/BlogHome.naver?directoryNo=0&currentPage={page}&groupId=0")
             
             print("7. 이웃새글 목록 로드 대기...")
             # 이웃새글 목록이 로드될 때까지 대기
@@ -679,48 +340,39 @@ class NaverBot:
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'section.wrap_thumbnail_post_list'))
             )
             
-            # 페이지 끝까지 스크롤
+            # 카드 개수가 안정될 때까지 기다린 뒤 페이지 끝까지 스크롤, 추가 로딩도 같은 방식으로 대기
+            self.wait_for_stable_count(buddy_section, 'div.item.multi_pic', 10)
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            self.wait_for_stable_count(buddy_section, 'div.item.multi_pic', 5)
             
-            # 이웃새글 섹션 내의 게시물만 선택
-            posts = buddy_section.find_elements(By.CSS_SELECTOR, 'div.item.multi_pic')
+            # 이웃새글 섹션 내의 게시물 카드 정보를 한 번에 추출
+            cards = self.driver.execute_script(self.EXTRACT_POST_CARDS_JS, buddy_section, 'div.item.multi_pic') or []
             
-            print(f"8. 찾은 이웃 게시물 수: {len(posts)}")
+            print(f"8. 찾은 이웃 게시물 수: {len(cards)}")
             
             blog_links = []
             seen_urls = set()
             
             print("9. 게시물 정보 추출 시작...")
-            # 게시물 정보 추출
-            for i, post in enumerate(posts, 1):
-                try:
-                    print(f"\n게시물 {i} 처리 중...")
-                    
-                    # 게시물 링크에서 blogId와 logNo 추출
-                    post_link = post.find_element(By.CSS_SELECTOR, 'a.desc_inner')
-                    href = post_link.get_attribute('href')
-                    print(f"링크: {href}")
-                    
-                    if not href or href in seen_urls:
-                        print("이미 처리된 링크이거나 유효하지 않은 링크입니다.")
-                        continue
-                    
-                    blog_id_match = re.search(r'blog\.naver\.com/([^/]+)', href)
-                    post_id_match = re.search(r'/(\d+)(?:\?|$)', href)
-                    
-                    if blog_id_match and post_id_match:
-                        blog_id = blog_id_match.group(1)
-                        post_id = post_id_match.group(1)
-                        print(f"블로그 ID: {blog_id}, 포스트 ID: {post_id}")
-                        
-                        blog_links.append((blog_id, post_id))
-                        seen_urls.add(href)
-                        print(f"게시물 {i} 처리 완료")
-                        
-                except Exception as e:
-                    print(f"게시물 {i} 처리 중 오류 발생: {str(e)}")
+            # 게시물 링크에서 blogId와 logNo 추출
+            for i, card in enumerate(cards, 1):
+                href = card.get('href')
+                print(f"\n게시물 {i}: {card.get('title', '')} / 링크: {href}")
+                
+                if not href or href in seen_urls:
+                    print("이미 처리된 링크이거나 유효하지 않은 링크입니다.")
                     continue
+                
+                blog_id_match = re.search(r'blog\.naver\.com/([^/]+)', href)
+                post_id_match = re.search(r'/(\d+)(?:\?|$)', href)
+                
+                if blog_id_match and post_id_match:
+                    blog_id = blog_id_match.group(1)
+                    post_id = post_id_match.group(1)
+                    print(f"블로그 ID: {blog_id}, 포스트 ID: {post_id}")
+                    
+                    blog_links.append((blog_id, post_id))
+                    seen_urls.add(href)
             
             # 최대 10개로 제한
             result_links = blog_links[:10]
@@ -734,15 +386,66 @@ class NaverBot:
             print(f"상세 오류: {e.__class__.__name__}")
             return []
 
+def prompt_settings() -> Dict:
+    """로그인 정보, 댓글 생성 방식, 처리할 페이지 수를 입력받습니다."""
+    print("\n=== 네이버 로그인 정보 입력 ===")
+    id = input("네이버 아이디를 입력하세요: ")
+    pw = input("네이버 비밀번호를 입력하세요: ")
+    nickname = input("확인할 닉네임을 입력하세요: ")
+    
+    # 댓글 생성 방식 선택
+    while True:
+        try:
+            print("\n=== 댓글 생성 방식 선택 ===")
+            print("1. 템플릿 댓글 사용 (미리 정의된 댓글을 순서대로 사용)")
+            print("2. Gemini AI 사용 (블로그 내용을 분석하여 댓글 생성)")
+            comment_type = int(input("댓글 생성 방식을 선택하세요 (1 또는 2): "))
+            if comment_type in [1, 2]:
+                use_gemini = (comment_type == 2)
+                break
+            else:
+                print("1 또는 2를 입력해주세요.")
+        except ValueError:
+            print("올바른 숫자를 입력해주세요.")
+    
+    # 페이지 수 입력
+    while True:
+        try:
+            max_pages = int(input("몇 페이지까지 처리할까요? (1-10): "))
+            if 1 <= max_pages <= 10:
+                break
+            else:
+                print("1에서 10 사이의 숫자를 입력해주세요.")
+        except ValueError:
+            print("올바른 숫자를 입력해주세요.")
+    print("===========================\n")
+    
+    return {'id': id, 'pw': pw, 'nickname': nickname, 'use_gemini': use_gemini, 'max_pages': max_pages}
+
 def run():
     """프로그램 실행"""
+    parser = argparse.ArgumentParser(description="네이버 이웃새글 자동 좋아요/댓글")
+    parser.add_argument('--profile', action='store_true', help="cProfile/tracemalloc/RSS 보고서를 profiles/<실행 시각>/ 폴더에 저장")
+    parser.add_argument('--resume', action='store_true', help="이전 실행이 중단된 위치(checkpoint.json)부터 이어서 처리")
+    parser.add_argument('--cbox-token-ttl', type=float, help="댓글용 cbox_token 재사용 시간(초), 기본값은 AUTO_REPLY_CBOX_TOKEN_TTL 또는 600")
+    args = parser.parse_args()
+    
+    bot = None
     try:
         # 봇 인스턴스 생성
-        bot = NaverBot()
+        bot = NaverBot(**prompt_settings(), cbox_token_ttl=args.cbox_token_ttl, profile=args.profile, resume=args.resume)
+        
+        # 저장된 세션 확인, 없거나 만료되었으면 웹드라이버 초기화 및 로그인
+        if not bot.ensure_login():
+            print("로그인에 실패했습니다. 프로그램을 종료합니다.")
+            if bot.driver:
+                bot.driver.quit()
+            return
+            
         bot.process_pages()
     except Exception as e:
         print(f"프로그램 실행 중 오류 발생: {str(e)}")
-        if bot.driver:
+        if bot and bot.driver:
             bot.driver.quit()
 
 if __name__ == "__main__":
@@ -3,74 +3,59 @@ import os
 import time
 import random
 import re
-import requests
 import platform
 import json
-import pyperclip
-from bs4 import BeautifulSoup
-from typing import Optional, Tuple, List
-from dotenv import load_dotenv
-import google.generativeai as genai
+import threading
+import queue
+import logging
+from logging.handlers import RotatingFileHandler
+from collections import deque
+from typing import Tuple, List
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QComboBox, QSpinBox, QTextEdit, QMessageBox
+    QComboBox, QSpinBox, QPlainTextEdit, QMessageBox, QCheckBox
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-import undetected_chromedriver as uc
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal
 from threading import Event
 
-class NaverBot:
-    def __init__(self, id, pw, nickname, use_gemini, start_page, end_page, log_callback=None, stop_flag=None, gemini_api_key=None):
-        if gemini_api_key:
-            self.gemini_api_key = gemini_api_key
-        else:
-            load_dotenv()
-            self.gemini_api_key = os.getenv('GEMINI_API_KEY')
-        self.cookies = {}
-        self.headers = {
-            'accept': '*/*',
-            'accept-encoding': 'gzip, deflate, br, zstd',
-            'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-        }
-        self.driver = None
-        if self.gemini_api_key:
-            genai.configure(api_key=self.gemini_api_key)
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
-        self.comment_templates = [
-            "좋은 글 잘 읽었습니다. 감사합니다!",
-            "유익한 정보 감사합니다. 잘 보고 갑니다!",
-            "정말 도움이 되는 글이네요. 공감합니다!",
-            "글 잘 읽었습니다. 다음 글도 기대됩니다!",
-            "좋은 정보 공유해주셔서 감사합니다!"
-        ]
-        self.current_template_index = 0
-        self.id = id
-        self.pw = pw
-        self.nickname = nickname
-        self.use_gemini = use_gemini
-        self.start_page = start_page
-        self.end_page = end_page
-        self.log_callback = log_callback
-        self.stop_flag = stop_flag
+from naver_core import NaverClient
+
+
+# 전체 실행 로그를 남길 폴더, 화면에는 최근 로그만 보임
+LOG_DIR = os.path.join(os.path.dirname(__file__), "logs")
+
+def get_file_logger() -> logging.Logger:
+    """logs/auto_reply.log에 쓰는 로거를 돌려줍니다. 파일이 커지면 새 파일로 넘기고 오래된 파일은 지웁니다."""
+    logger = logging.getLogger('auto_reply')
+    if not logger.handlers:
+        os.makedirs(LOG_DIR, exist_ok=True)
+        handler = RotatingFileHandler(os.path.join(LOG_DIR, 'auto_reply.log'), maxBytes=5 * 1024 * 1024, backupCount=5, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
 
-    def log(self, msg):
-        if self.log_callback:
-            self.log_callback(msg)
-        else:
-            print(msg)
 
-    def should_stop(self):
-        return self.stop_flag and self.stop_flag.is_set()
+class NaverBot(NaverClient):
+    # driver.get은 중지 요청으로 끊을 수 없으므로 짧게 두고, DOMContentLoaded까지만 기다림(eager) 뒤 필요한 요소는 wait_until로 기다림
+    PAGE_LOAD_TIMEOUT = 10
+    CAPTCHA_TIMEOUT = 300  # 캡차/보안 확인을 브라우저에서 직접 풀 때까지 기다리는 최대 시간
+    DRIVER_QUIT_TIMEOUT = 1  # 이 시간 안에 크롬이 닫히지 않으면 종료는 백그라운드에서 마저 진행
+
+    def __init__(self, id, pw, nickname, use_gemini, start_page, end_page, log_callback=None, stop_flag=None, gemini_api_key=None, browserless=True, cbox_token_ttl=None, profile=False, resume=False):
+        super().__init__(id, pw, nickname, use_gemini, start_page, end_page, log_callback=log_callback, stop_flag=stop_flag,
+                         gemini_api_key=gemini_api_key, browserless=browserless, cbox_token_ttl=cbox_token_ttl, profile=profile, resume=resume)
+
+    def wait_until(self, condition, timeout: float):
+        """웹드라이버에서 condition이 참이 될 때까지 기다립니다. 중지 요청이 들어오면 None을 돌려줍니다."""
+        from selenium.webdriver.support.ui import WebDriverWait
+        result = WebDriverWait(self.driver, timeout, poll_frequency=0.3).until(lambda driver: self.should_stop() or condition(driver))
+        return None if self.should_stop() else result
 
     def initialize_driver(self):
+        import undetected_chromedriver as uc
         if self.driver:
             return
         options = uc.ChromeOptions()
@@ -87,7 +72,9 @@ class NaverBot:
         options.add_argument('--disable-browser-side-navigation')
         options.add_argument('--disable-features=IsolateOrigins,site-per-process')
         options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        options.page_load_strategy = 'eager'
         self.driver = uc.Chrome(options=options)
+        self.driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT)
         self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
             'source': '''
                 Object.defineProperty(navigator, 'webdriver', {
@@ -96,412 +83,215 @@ class NaverBot:
             '''
         })
 
+    def ensure_login(self) -> bool:
+        """저장된 세션이 유효하면 재사용하고, 아니면 브라우저로 로그인합니다."""
+        if self.restore_session():
+            self.log("저장된 로그인 세션이 유효하여 브라우저 로그인을 건너뜁니다.")
+            if self.browserless:
+                self.log("브라우저 없이 실행합니다.")
+            else:
+                self.initialize_driver()
+                self.copy_cookies_to_driver()
+            return True
+        self.initialize_driver()
+        if not self.login():
+            return False
+        self.save_session()
+        return True
+
+    def copy_cookies_to_driver(self) -> None:
+        if not self.driver:
+            return
+        try:
+            self.driver.get("https://www.naver.com")
+            for cookie in self.session.cookies:
+                if cookie.domain.endswith('naver.com'):
+                    self.driver.add_cookie({'name': cookie.name, 'value': cookie.value, 'domain': cookie.domain, 'path': cookie.path})
+        except Exception as e:
+            self.log(f"웹드라이버 쿠키 설정 실패: {str(e)}")
+
     def login(self):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
         try:
             self.log("네이버 로그인 페이지 접속...")
             self.driver.get("https://nid.naver.com/nidlogin.login")
-            time.sleep(random.uniform(2, 4))
-            id_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input.input_id"))
-            )
-            time.sleep(random.uniform(1, 2))
+            # 대기마다 중지 요청을 확인하고, 중지되면 로그인을 그만둠
+            id_input = self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, "input.input_id")), 10)
+            if id_input is None or self.sleep(random.uniform(1, 2)):
+                return False
             self.copy_paste_text(id_input, self.id)
-            pw_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "input.input_pw"))
-            )
-            time.sleep(random.uniform(1, 2))
+            pw_input = self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, "input.input_pw")), 10)
+            if pw_input is None or self.sleep(random.uniform(1, 2)):
+                return False
             self.copy_paste_text(pw_input, self.pw)
-            login_button = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "log.login"))
-            )
-            time.sleep(random.uniform(1, 2))
+            login_button = self.wait_until(EC.presence_of_element_located((By.ID, "log.login")), 10)
+            if login_button is None or self.sleep(random.uniform(1, 2)):
+                return False
             login_button.click()
-            time.sleep(random.uniform(3, 5))
-            try:
-                current_title = self.driver.title
-                if current_title and "로그인" in current_title:
-                    self.log("캡차나 보안 문제가 발생했습니다. 브라우저에서 직접 로그인 후 엔터를 눌러주세요.")
-                    input()
-            except Exception:
-                pass
+            # 고정 대기 대신 로그인 쿠키가 생기는 시점까지 대기
+            if not self.wait_for_login_cookie(15):
+                if self.should_stop():
+                    return False
+                # 콘솔 입력 대신 사용자가 브라우저에서 로그인을 마쳐 쿠키가 생길 때까지 기다림
+                self.log(f"캡차나 보안 문제가 발생했습니다. 브라우저에서 직접 로그인을 완료해주세요. (최대 {self.CAPTCHA_TIMEOUT // 60}분 대기)")
+                if not self.wait_for_login_cookie(self.CAPTCHA_TIMEOUT):
+                    if not self.should_stop():
+                        self.log("로그인이 확인되지 않았습니다.")
+                    return False
+            self.sync_cookies()
             return True
         except Exception as e:
             self.log(f"로그인 중 오류 발생: {str(e)}")
             return False
 
-    def wait_random_time(self, min_seconds: float, max_seconds: float):
-        time.sleep(random.uniform(min_seconds, max_seconds))
+    def wait_for_login_cookie(self, timeout: float) -> bool:
+        """로그인 쿠키(NID_AUT)가 생길 때까지 기다립니다."""
+        from selenium.common.exceptions import TimeoutException
+        try:
+            return bool(self.wait_until(lambda driver: driver.get_cookie('NID_AUT'), timeout))
+        except TimeoutException:
+            return False
+
+    def wait_for_stable_count(self, container, selector: str, timeout: float) -> int:
+        """컨테이너 안의 요소 개수가 더 이상 늘지 않을 때까지 기다린 뒤 개수를 돌려줍니다."""
+        deadline = time.monotonic() + timeout
+        last_count, stable_polls = -1, 0
+        while time.monotonic() < deadline:
+            count = self.driver.execute_script("return arguments[0].querySelectorAll(arguments[1]).length;", container, selector)
+            if count and count == last_count:
+                stable_polls += 1
+                if stable_polls >= 2:
+                    break
+            else:
+                stable_polls = 0
+            last_count = count
+            if self.sleep(0.3):
+                break
+        return max(last_count, 0)
+
+    def quit_driver(self):
+        """웹드라이버를 닫습니다. 크롬이 늦게 닫혀도 DRIVER_QUIT_TIMEOUT 이상 기다리지 않습니다."""
+        if not self.driver:
+            return
+        driver, self.driver = self.driver, None  # quit 후 driver 참조 방지
+        quitter = threading.Thread(target=driver.quit, name='driver-quit', daemon=True)
+        quitter.start()
+        quitter.join(self.DRIVER_QUIT_TIMEOUT)
+        if quitter.is_alive():
+            self.log("\n웹드라이버 종료를 백그라운드에서 마무리합니다.")
+        else:
+            self.log("\n웹드라이버가 종료되었습니다.")
 
     def process_pages(self):
+        # 수집(discover_posts 스레드) → 읽기 작업(enrich_executor) → 좋아요/댓글 작성(이 스레드, 대기 시간 그대로) 순서의 파이프라인
+        posts_queue = queue.Queue(maxsize=self.PIPELINE_DEPTH)
+        stop_event = threading.Event()
+        discovery = None
         try:
+            if self.profiler:
+                self.profiler.start()
+            if self.resume:
+                if self.checkpoint.load():
+                    self.log(f"체크포인트에서 이어서 실행합니다. ({self.checkpoint.discovered_page}페이지까지 수집됨, 남은 포스트 {len(self.checkpoint.pending)}개, 마지막으로 처리한 포스트: {self.checkpoint.last_log_no})")
+                else:
+                    self.log("이어서 실행할 체크포인트가 없어 처음부터 실행합니다.")
             total_processed = 0
-            for page in range(self.start_page, self.end_page + 1):
-                if self.should_stop():
-                    self.log("작업이 중지되었습니다.")
+            total_skipped = 0
+            current_page = None
+            self.enrich_executor = ThreadPoolExecutor(max_workers=self.ENRICH_WORKERS, thread_name_prefix='enrich')
+            discovery = threading.Thread(target=self.profiled(self.discover_posts), args=(posts_queue, stop_event), name='discovery', daemon=True)
+            discovery.start()
+            while True:
+                if self.should_stop() or self.session_expired:
+                    break
+                try:
+                    item = posts_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is None:  # 수집 종료
                     break
-                self.log(f"\n=== {page}페이지 처리 시작 ===")
-                neighbor_blogs = self.get_neighbor_blogs(page)
-                if not neighbor_blogs:
-                    self.log(f"{page}페이지의 이웃 블로그 목록을 가져오는데 실패했습니다.")
-                    break  # break로 반복문 즉시 종료
-                self.log(f"총 {len(neighbor_blogs)}개의 이웃 블로그를 찾았습니다.")
-                for blog_id, blog_post_id in neighbor_blogs:
-                    if self.should_stop():
-                        self.log("작업이 중지되었습니다.")
-                        break
-                    self.log(f"\n처리 중: {blog_id}의 포스트 {blog_post_id}")
-                    self.like_post(blog_id, blog_post_id)
-                    self.wait_random_time(2, 4)
+                if 'page_done' in item:
+                    page = item['page_done']
+                    self.log(f"\n{page}페이지 처리가 완료되었습니다.")
+                    if self.profiler:
+                        self.profiler.page_done(page)
+                    if page < self.end_page:
+                        self.log(f"\n{page+1}페이지 처리 전 대기 중...")
+                        self.wait_random_time(5, 7)
+                    continue
+                if item['page'] != current_page:
+                    current_page = item['page']
+                    self.log(f"\n=== {current_page}페이지 처리 시작 ===")
+                blog_id, blog_post_id = item['blog_id'], item['blog_post_id']
+                # 수집 때 읽은 장부/좋아요 상태/댓글 확인은 그 사이 처리한 결과를 모르므로 처리 직전에 장부를 다시 읽음
+                record = self.ledger.get(blog_id, blog_post_id) or {}
+                # 이전 실행에서 이미 처리한 포스트는 네트워크 요청 없이 건너뜀
+                if record.get('liked_at') and record.get('commented_at'):
+                    self.log(f"\n건너뜀: {blog_id}의 포스트 {blog_post_id}는 이미 처리되었습니다.")
+                    total_skipped += 1
+                    self.mark_checkpoint_done(item)
+                    continue
+                self.log(f"\n처리 중: {blog_id}의 포스트 {blog_post_id}")
+                post_started = time.perf_counter()
+                if not record.get('liked_at'):
+                    like_state = item['like_state']
+                    self.like_post(blog_id, blog_post_id, like_state)
+                    # 이미 공감한 포스트는 좋아요 요청을 보내지 않으므로 대기도 생략
+                    if not (like_state and like_state['is_reacted']):
+                        self.wait_random_time(2, 4)
+                if self.should_stop():
+                    continue
+                if not (self.ledger.get(blog_id, blog_post_id) or {}).get('commented_at'):
                     try:
-                        self.write_comment(blog_id, blog_post_id)
+                        prepared = None
+                        if item['prepared']:
+                            try:
+                                prepared = self.wait_for_future(item['prepared'])
+                            except Exception as e:
+                                self.log(f"미리 준비한 댓글을 가져오지 못했습니다: {str(e)}")
+                        if not self.should_stop():
+                            self.write_comment(blog_id, blog_post_id, prepared)
                     except Exception as e:
                         self.log(f"댓글 작성 중 오류 발생: {str(e)}")
-                    total_processed += 1
-                    self.wait_random_time(3, 5)
-                self.log(f"\n{page}페이지 처리가 완료되었습니다.")
-                if page < self.end_page:
-                    self.log(f"\n{page+1}페이지 처리 전 대기 중...")
-                    self.wait_random_time(5, 7)
-            self.log(f"\n모든 처리가 완료되었습니다. 총 {total_processed}개의 포스트를 처리했습니다.")
+                total_processed += 1
+                self.metrics.add_timing('post', time.perf_counter() - post_started)
+                self.mark_checkpoint_done(item)
+                self.wait_random_time(3, 5)
+            if self.should_stop() or self.session_expired:
+                self.log(f"\n작업이 중지되었습니다. 중지 전까지 {total_processed}개의 포스트를 처리했습니다. (이미 처리되어 건너뛴 포스트: {total_skipped}개)")
+            else:
+                self.log(f"\n모든 처리가 완료되었습니다. 총 {total_processed}개의 포스트를 처리했습니다. (이미 처리되어 건너뛴 포스트: {total_skipped}개)")
         except Exception as e:
             self.log(f"페이지 처리 중 오류 발생: {str(e)}")
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None  # quit 후 driver 참조 방지
-                self.log("\n웹드라이버가 종료되었습니다.")
-
-    def get_cbox_token(self, blog_id: str, blog_post_id: str) -> Optional[str]:
-        try:
-            url = "https://apis.naver.com/commentBox/cbox/web_naver_token_jsonp.json"
-            params = {
-                'ticket': 'blog',
-                'templateId': 'default',
-                'pool': 'blogid',
-                'lang': 'ko',
-                'country': '',
-                'objectId': f'154352947_201_{blog_post_id}',
-                '_cv': '20240923174033',
-                'categoryId': '',
-                'groupId': '154352947',
-            }
-            headers = {
-                'accept': '*/*',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': 'https://m.blog.naver.com/CommentList.naver',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'script',
-                'sec-fetch-mode': 'no-cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-            response = session.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            return response.json()['result']['cbox_token']
-        except Exception as e:
-            self.log(f"cbox_token 가져오기 실패: {str(e)}")
-            return None
-
-    def get_blog_no(self, blog_id: str, blog_post_id: str) -> Optional[str]:
-        try:
-            url = f'https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={blog_post_id}'
-            response = requests.get(url)
-            response.raise_for_status()
-            content = response.content.decode('utf-8')
-            match = re.search(r"blogNo\s*=\s*'(\d+)'", content)
-            return match.group(1) if match else None
-        except Exception as e:
-            self.log(f"블로그 번호 가져오기 실패: {str(e)}")
-            return None
-
-    def get_blog_content(self, blog_id: str, blog_post_id: str) -> Optional[str]:
-        try:
-            url = f'https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={blog_post_id}'
-            response = requests.get(url)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-            content = soup.find('div', {'class': 'se-main-container'})
-            if not content:
-                content = soup.find('div', {'id': 'postViewArea'})
-            if content:
-                text = content.get_text(separator=' ', strip=True)
-                return text[:2000]
-            return None
-        except Exception as e:
-            self.log(f"블로그 내용 가져오기 실패: {str(e)}")
-            return None
-
-    def generate_comment_with_gemini(self, blog_content: str) -> Optional[str]:
-        try:
-            prompt = f"""
-            다음 블로그 글을 읽고 적절한 댓글을 작성해주세요.
-            댓글은 1-2문장으로 간단하게 작성하고, 블로그 내용을 잘 이해했다는 것을 보여주면서
-            긍정적이고 격려하는 톤으로 작성해주세요.
-            블로그 내용:
-            {blog_content}
-            """
-            response = self.model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            self.log(f"Gemini 댓글 생성 실패: {str(e)}")
-            return None
-
-    def has_commented(self, blog_id: str, blog_post_id: str) -> bool:
-        try:
-            blog_Num = self.get_blog_no(blog_id, blog_post_id)
-            if not blog_Num:
-                self.log("블로그 번호를 가져오지 못했습니다.")
-                return False
-            url = f"https://apis.naver.com/commentBox/cbox/web_naver_list_json.json"
-            params = {
-                'ticket': 'blog',
-                'templateId': 'default',
-                'pool': 'blogid',
-                'lang': 'ko',
-                'country': '',
-                'objectId': f'{blog_Num}_201_{blog_post_id}',
-                'categoryId': '',
-                'pageSize': '100',
-                'indexSize': '10',
-                'groupId': blog_Num,
-                'listType': 'OBJECT',
-                'pageType': 'more',
-                'objectUrl': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                '_cv': str(int(time.time() * 1000))
-            }
-            headers = {
-                'accept': 'application/json, text/javascript, */*; q=0.01',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-            response = session.get(url, params=params, headers=headers)
-            result = response.json()
-            if 'result' in result and 'commentList' in result['result']:
-                for comment in result['result']['commentList']:
-                    if comment.get('userName') == self.nickname:
-                        self.log(f"이미 '{self.nickname}' 님이 댓글을 작성하셨습니다.")
-                        return True
-            return False
-        except Exception as e:
-            self.log(f"댓글 목록 확인 중 오류 발생: {str(e)}")
-            return False
-
-    def write_comment(self, blog_id: str, blog_post_id: str) -> bool:
-        try:
-            if self.has_commented(blog_id, blog_post_id):
-                self.log("이미 댓글을 작성한 포스트입니다.")
-                return False
-            if self.use_gemini:
-                blog_content = self.get_blog_content(blog_id, blog_post_id)
-                if not blog_content:
-                    self.log("블로그 내용을 가져오지 못했습니다.")
-                    return False
-                comment_content = self.generate_comment_with_gemini(blog_content)
-                if not comment_content:
-                    self.log("댓글 생성에 실패했습니다.")
-                    return False
-            else:
-                comment_content = self.comment_templates[self.current_template_index]
-                self.current_template_index = (self.current_template_index + 1) % len(self.comment_templates)
-            blog_Num = self.get_blog_no(blog_id, blog_post_id)
-            if not blog_Num:
-                self.log("블로그 번호를 가져오지 못했습니다.")
-                return False
-            cbox_token = self.get_cbox_token(blog_id, blog_post_id)
-            if not cbox_token:
-                self.log("cbox_token을 가져오지 못했습니다.")
-                return False
-            url = "https://apis.naver.com/commentBox/cbox/web_naver_create_json.json"
-            params = {
-                'ticket': 'blog',
-                'templateId': 'default',
-                'pool': 'blogid',
-                '_cv': str(int(time.time() * 1000))
-            }
-            data = {
-                'lang': 'ko',
-                'country': '',
-                'objectId': f'{blog_Num}_201_{blog_post_id}',
-                'categoryId': '',
-                'pageSize': '100',
-                'indexSize': '10',
-                'groupId': f'{blog_Num}',
-                'listType': 'OBJECT',
-                'pageType': 'more',
-                'objectUrl': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                'contents': comment_content,
-                'userType': '',
-                'pick': 'false',
-                'manager': 'false',
-                'score': '0',
-                'sort': 'NEW',
-                'secret': 'false',
-                'refresh': 'false',
-                'imageCount': '0',
-                'commentType': 'txt',
-                'validateBanWords': 'false',
-                'cbox_token': cbox_token
-            }
-            headers = {
-                'accept': 'application/json, text/javascript, */*; q=0.01',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'origin': 'https://m.blog.naver.com',
-                'referer': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'empty',
-                'sec-fetch-mode': 'cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
-                'content-type': 'application/x-www-form-urlencoded'
-            }
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-            response = session.post(url, params=params, headers=headers, data=data)
-            result = response.json()
-            if 'success' in result and result['success']:
-                self.log("댓글 작성 성공!")
-                return True
-            else:
-                self.log("댓글 작성 실패")
-                return False
-        except Exception as e:
-            self.log(f"댓글 작성 중 오류 발생: {str(e)}")
-            return False
-
-    def get_like_tokens(self, blog_id: str, blog_post_id: str) -> Tuple[Optional[str], Optional[str]]:
-        try:
-            url = "https://apis.naver.com/blogserver/like/v1/search/contents"
-            params = {
-                'suppress_response_codes': 'true',
-                'pool': 'blogid',
-                'q': f'BLOG[{blog_id}_{blog_post_id}]',
-                'isDuplication': 'true',
-                'cssIds': 'BASIC_MOBILE,BLOG_MOBILE',
-            }
-            response = requests.get(url, params=params, headers=self.headers, cookies=self.cookies)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('timestamp'), data.get('guestToken')
-        except Exception as e:
-            self.log(f"좋아요 토큰 가져오기 실패: {str(e)}")
-            return None, None
-
-    def like_post(self, blog_id: str, blog_post_id: str) -> bool:
-        try:
-            token_url = "https://apis.naver.com/blogserver/like/v1/search/contents"
-            token_params = {
-                'suppress_response_codes': 'true',
-                'pool': 'blogid',
-                'q': f'BLOG[{blog_id}_{blog_post_id}]',
-                'isDuplication': 'true',
-                'cssIds': 'BASIC_MOBILE,BLOG_MOBILE',
-            }
-            token_headers = {
-                'accept': '*/*',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': 'https://m.blog.naver.com/PostView.naver',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'script',
-                'sec-fetch-mode': 'no-cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            session = requests.Session()
-            for cookie in self.driver.get_cookies():
-                session.cookies.set(cookie['name'], cookie['value'])
-            self.log("\ntimestamp와 guestToken 가져오는 중...")
-            token_response = session.get(token_url, params=token_params, headers=token_headers)
-            token_result = token_response.json()
-            timestamp = token_result.get('timestamp')
-            guest_token = token_result.get('guestToken')
-            if not timestamp or not guest_token:
-                self.log("timestamp 또는 guestToken을 가져오지 못했습니다.")
-                return False
-            url = f"https://apis.naver.com/blogserver/like/v1/services/BLOG/contents/{blog_id}_{blog_post_id}"
-            self.log(f"좋아요 API URL: {url}")
-            params = {
-                'suppress_response_codes': 'true',
-                '_method': 'POST',
-                'pool': 'blogid',
-                'displayId': 'BLOG',
-                'reactionType': 'like',
-                'categoryId': 'post',
-                'guestToken': guest_token,
-                'timestamp': timestamp,
-                '_ch': 'mbw',
-                'isDuplication': 'true',
-                'lang': 'ko',
-                'countType': 'DEFAULT',
-                'count': '1',
-                'history': '',
-                'runtimeStatus': '',
-                'isPostTimeline': 'false',
-                '_': timestamp
-            }
-            headers = {
-                'accept': '*/*',
-                'accept-encoding': 'gzip, deflate, br, zstd',
-                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-                'referer': 'https://m.blog.naver.com/PostView.naver',
-                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
-                'sec-ch-ua-mobile': '?0',
-                'sec-ch-ua-platform': '"Windows"',
-                'sec-fetch-dest': 'script',
-                'sec-fetch-mode': 'no-cors',
-                'sec-fetch-site': 'same-site',
-                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
-            }
-            self.log("\n좋아요 요청 전송 중...")
-            response = session.get(url, params=params, headers=headers)
-            self.log(f"응답 상태 코드: {response.status_code}")
-            result = response.json()
-            if 'statusCode' in result:
-                if result['statusCode'] == 200 or (result['statusCode'] == 409 and result['message'] == '이미 공감한 컨텐츠입니다.'):
-                    self.log(f"이미 이 포스트에 공감을 하셨습니다.")
-                    return True
-                else:
-                    self.log(f"좋아요 실패: {result.get('message', '알 수 없는 오류')}")
-                    return False
-            elif 'isReacted' in result and result['isReacted']:
-                self.log(f"좋아요 성공! 현재 좋아요 수: {result['count']}")
-                return True
-            else:
-                self.log("좋아요 실패: 응답 형식이 예상과 다릅니다.")
-                return False
-        except Exception as e:
-            self.log(f"좋아요 실패: {str(e)}")
-            self.log(f"상세 오류: {e.__class__.__name__}")
-            return False
+            stop_event.set()
+            if discovery:
+                # 수집 스레드는 데몬이고 큐 대기도 0.5초마다 stop_event를 확인하므로 오래 기다리지 않음
+                discovery.join(timeout=0.5)
+            if self.enrich_executor:
+                self.enrich_executor.shutdown(wait=False, cancel_futures=True)
+                self.enrich_executor = None
+            # 끝까지 처리했으면 체크포인트를 지우고, 중단되었으면 그 사이 준비된 댓글까지 저장
+            if self.checkpoint.is_complete(self.end_page):
+                self.checkpoint.remove()
+            elif self.checkpoint.save():
+                self.log("진행 상황을 저장했습니다. 이어서 실행을 선택하면 중단된 위치부터 처리합니다.")
+            if self.profiler:
+                self.profiler.stop()
+                self.log(f"프로파일 결과를 저장했습니다: {self.profiler.directory}")
+            self.write_metrics()
+            self.save_session()  # 실행 중 갱신된 쿠키까지 저장
+            self.quit_driver()
 
     def copy_paste_text(self, element, text):
+        import pyperclip
+        from selenium.webdriver.common.action_chains import ActionChains
+        from selenium.webdriver.common.keys import Keys
         pyperclip.copy(text)
-        time.sleep(0.5)
+        self.sleep(0.5)
         element.click()
-        time.sleep(0.5)
+        self.sleep(0.5)
         if platform.system() == 'Darwin':
             actions = ActionChains(self.driver)
             actions.key_down(Keys.COMMAND).send_keys('v').key_up(Keys.COMMAND)
@@ -510,56 +300,52 @@ class NaverBot:
             actions = ActionChains(self.driver)
             actions.key_down(Keys.CONTROL).send_keys('v').key_up(Keys.CONTROL)
             actions.perform()
-        time.sleep(0.5)
+        self.sleep(0.5)
 
-    def get_neighbor_blogs(self, page: int = 1) -> List[Tuple[str, str]]:
-        """이웃새글 목록을 가져옵니다."""
+    def get_neighbor_blogs_from_browser(self, page: int = 1) -> List[Tuple[str, str]]:
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        if not self.driver:
+            # HTTP 피드를 쓰지 않거나(use_http_feed) 브라우저 모드에서 피드 조회가 실패했을 때만 크롬을 띄움
+            self.log("브라우저로 이웃새글을 가져오기 위해 웹드라이버를 시작합니다.")
+            self.initialize_driver()
+            self.copy_cookies_to_driver()
         try:
             self.log(f"6. 네이버 블로그 홈페이지로 이동 (페이지 {page})...")
-            self.driver.get(f"https://section.blog.naver.com/BlogHome.naver?directoryNo=0&currentPage={page}&groupId=0")
-            time.sleep(5)  # 페이지 로딩 대기
-
+            self.driver.get(f"{self.SECTION_URL}/BlogHome.naver?directoryNo=0&currentPage={page}&groupId=0")
             self.log("7. 이웃새글 목록 로드 대기...")
-            wait = WebDriverWait(self.driver, 15)
-            buddy_section = wait.until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'section.wrap_thumbnail_post_list'))
-            )
+            buddy_section = self.wait_until(EC.presence_of_element_located((By.CSS_SELECTOR, 'section.wrap_thumbnail_post_list')), 15)
+            if buddy_section is None:
+                return []
 
+            # 카드 개수가 안정될 때까지 기다린 뒤 스크롤, 추가 로딩도 같은 방식으로 대기
+            self.wait_for_stable_count(buddy_section, 'div.item', 10)
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            self.wait_for_stable_count(buddy_section, 'div.item', 5)
 
-            # 이웃새글 섹션 내의 게시물 모두 선택 (multi_pic, 일반 item 모두)
-            posts = buddy_section.find_elements(By.CSS_SELECTOR, 'div.item')
-            self.log(f"8. 찾은 이웃 게시물 수: {len(posts)}")
+            # 이웃새글 섹션 내의 게시물 모두 선택 (multi_pic, 일반 item 모두), 카드 정보는 한 번에 추출
+            cards = self.driver.execute_script(self.EXTRACT_POST_CARDS_JS, buddy_section, 'div.item') or []
+            self.log(f"8. 찾은 이웃 게시물 수: {len(cards)}")
 
             blog_links = []
             seen_urls = set()
             self.log("9. 게시물 정보 추출 시작...")
-            for i, post in enumerate(posts, 1):
-                try:
-                    self.log(f"\n게시물 {i} 처리 중...")
-                    post_link = post.find_element(By.CSS_SELECTOR, 'a.desc_inner')
-                    href = post_link.get_attribute('href')
-                    self.log(f"  - href: {href}")
-                    # 두 가지 패턴 모두 지원
-                    match = re.search(r'blogId=([\w\d_-]*)&logNo=(\d+)', href)
-                    if not match:
-                        match = re.search(r'/([\w\d_-]+)/([0-9]+)$', href)
-                    if match:
-                        if len(match.groups()) == 2:
-                            blog_id = match.group(1)
-                            blog_post_id = match.group(2)
-                            self.log(f"  - blog_id: {blog_id}, blog_post_id: {blog_post_id}")
-                            if href not in seen_urls:
-                                blog_links.append((blog_id, blog_post_id))
-                                seen_urls.add(href)
-                        else:
-                            self.log(f"  - 정규식 매칭 실패: {href}")
-                    else:
-                        self.log(f"  - 정규식 매칭 실패: {href}")
-                except Exception as e:
-                    self.log(f"게시물 {i} 처리 중 오류 발생: {str(e)}")
-                    continue
+            for i, card in enumerate(cards, 1):
+                href = card.get('href') or ''
+                self.log(f"\n게시물 {i}: {card.get('title', '')}")
+                self.log(f"  - href: {href}")
+                # 두 가지 패턴 모두 지원
+                match = re.search(r'blogId=([\w\d_-]*)&logNo=(\d+)', href)
+                if not match:
+                    match = re.search(r'/([\w\d_-]+)/([0-9]+)$', href)
+                if match:
+                    blog_id, blog_post_id = match.groups()
+                    self.log(f"  - blog_id: {blog_id}, blog_post_id: {blog_post_id}")
+                    if href not in seen_urls:
+                        blog_links.append((blog_id, blog_post_id))
+                        seen_urls.add(href)
+                else:
+                    self.log(f"  - 정규식 매칭 실패: {href}")
             # 최대 10개로 제한
             result_links = blog_links[:10]
             self.log(f"\n이웃새글 {len(result_links)}개를 찾았습니다.")
@@ -570,9 +356,8 @@ class NaverBot:
             return []
 
 class BotThread(QThread):
-    log_signal = pyqtSignal(str)
     finished_signal = pyqtSignal()
-    def __init__(self, id, pw, nickname, use_gemini, start_page, end_page, gemini_api_key):
+    def __init__(self, id, pw, nickname, use_gemini, start_page, end_page, gemini_api_key, browserless=True, profile=False, resume=False, cbox_token_ttl=None):
         super().__init__()
         from threading import Event
         self.id = id
@@ -582,24 +367,46 @@ class BotThread(QThread):
         self.start_page = start_page
         self.end_page = end_page
         self.gemini_api_key = gemini_api_key
+        self.browserless = browserless
+        self.profile = profile
+        self.resume = resume
+        self.cbox_token_ttl = cbox_token_ttl
         self._stop_flag = Event()
+        # 로그는 줄마다 화면에 보내지 않고 모아 두었다가 MainWindow의 타이머가 한꺼번에 가져감
+        self.log_buffer = deque()
+        self.file_logger = get_file_logger()
+    def log(self, msg):
+        self.log_buffer.append(msg)
+        self.file_logger.info(msg.strip('\n'))
+    def take_logs(self) -> List[str]:
+        lines = []
+        while self.log_buffer:
+            lines.append(self.log_buffer.popleft())
+        return lines
     def run(self):
         try:
-            bot = NaverBot(self.id, self.pw, self.nickname, self.use_gemini, self.start_page, self.end_page, log_callback=self.log_signal.emit, stop_flag=self._stop_flag, gemini_api_key=self.gemini_api_key)
-            bot.initialize_driver()
-            if not bot.login():
-                self.log_signal.emit("로그인에 실패했습니다. 프로그램을 종료합니다.")
+            bot = NaverBot(self.id, self.pw, self.nickname, self.use_gemini, self.start_page, self.end_page, log_callback=self.log, stop_flag=self._stop_flag, gemini_api_key=self.gemini_api_key, browserless=self.browserless, cbox_token_ttl=self.cbox_token_ttl, profile=self.profile, resume=self.resume)
+            if not bot.ensure_login():
+                if self._stop_flag.is_set():
+                    self.log("작업이 중지되었습니다.")
+                else:
+                    self.log("로그인에 실패했습니다. 프로그램을 종료합니다.")
+                bot.quit_driver()  # 로그인 도중 띄운 크롬이 남지 않도록 함
                 return
             bot.process_pages()
         except Exception as e:
-            self.log_signal.emit(f"오류 발생: {str(e)}")
+            self.log(f"오류 발생: {str(e)}")
         finally:
             self.finished_signal.emit()
     def stop(self):
         self._stop_flag.set()
+    def is_stopped(self) -> bool:
+        return self._stop_flag.is_set()
 
 class MainWindow(QMainWindow):
     SETTINGS_PATH = os.path.join(os.path.dirname(__file__), "settings.json")
+    LOG_FLUSH_INTERVAL_MS = 200  # 모아 둔 로그를 화면에 옮기는 주기
+    LOG_MAX_LINES = 5000  # 화면에 남길 최대 줄 수, 넘으면 오래된 줄부터 지워짐 (전체 로그는 logs 폴더)
     def __init__(self):
         super().__init__()
         self.setWindowTitle("네이버 블로그 자동 댓글 프로그램")
@@ -657,6 +464,15 @@ class MainWindow(QMainWindow):
         page_range_layout.addWidget(end_label)
         page_range_layout.addWidget(self.end_page_spin)
         input_layout.addLayout(page_range_layout)
+        options_layout = QHBoxLayout()
+        self.browserless_check = QCheckBox("저장된 로그인 세션이 있으면 브라우저 없이 실행")
+        self.browserless_check.setChecked(True)
+        options_layout.addWidget(self.browserless_check)
+        self.profile_check = QCheckBox("프로파일링 (CPU/메모리 보고서를 profiles 폴더에 저장)")
+        options_layout.addWidget(self.profile_check)
+        self.resume_check = QCheckBox("이어서 실행 (중단된 위치부터)")
+        options_layout.addWidget(self.resume_check)
+        input_layout.addLayout(options_layout)
         layout.addWidget(input_group)
         btn_layout = QHBoxLayout()
         self.start_btn = QPushButton("실행")
@@ -670,10 +486,15 @@ class MainWindow(QMainWindow):
         self.save_btn.clicked.connect(self.save_settings)
         btn_layout.addWidget(self.save_btn)
         layout.addLayout(btn_layout)
-        self.log_text = QTextEdit()
+        self.log_text = QPlainTextEdit()
         self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(self.LOG_MAX_LINES)
         layout.addWidget(self.log_text)
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_logs)
+        self.log_timer.start(self.LOG_FLUSH_INTERVAL_MS)
         self.bot_thread = None
+        self.cbox_token_ttl = None  # settings.json의 cbox_token_ttl(초), 없으면 AUTO_REPLY_CBOX_TOKEN_TTL 또는 기본값
         self.load_settings()
 
     def save_settings(self):
@@ -684,8 +505,13 @@ class MainWindow(QMainWindow):
             "comment_type": self.comment_type_combo.currentIndex(),
             "start_page": self.start_page_spin.value(),
             "end_page": self.end_page_spin.value(),
-            "gemini_api_key": self.gemini_input.text().strip()
+            "gemini_api_key": self.gemini_input.text().strip(),
+            "browserless": self.browserless_check.isChecked(),
+            "profile": self.profile_check.isChecked(),
+            "resume": self.resume_check.isChecked()
         }
+        if self.cbox_token_ttl is not None:
+            settings["cbox_token_ttl"] = self.cbox_token_ttl
         try:
             with open(self.SETTINGS_PATH, "w", encoding="utf-8") as f:
                 json.dump(settings, f, ensure_ascii=False, indent=2)
@@ -706,6 +532,10 @@ class MainWindow(QMainWindow):
             self.start_page_spin.setValue(settings.get("start_page", 1))
             self.end_page_spin.setValue(settings.get("end_page", 1))
             self.gemini_input.setText(settings.get("gemini_api_key", ""))
+            self.browserless_check.setChecked(settings.get("browserless", True))
+            self.profile_check.setChecked(settings.get("profile", False))
+            self.resume_check.setChecked(settings.get("resume", False))
+            self.cbox_token_ttl = settings.get("cbox_token_ttl")
         except Exception as e:
             QMessageBox.warning(self, "불러오기 실패", f"설정 불러오기 중 오류: {str(e)}")
 
@@ -717,6 +547,9 @@ class MainWindow(QMainWindow):
         start_page = self.start_page_spin.value()
         end_page = self.end_page_spin.value()
         gemini_api_key = self.gemini_input.text().strip()
+        browserless = self.browserless_check.isChecked()
+        profile = self.profile_check.isChecked()
+        resume = self.resume_check.isChecked()
         if not id or not pw or not nickname:
             QMessageBox.warning(self, "입력 오류", "아이디, 비밀번호, 닉네임을 모두 입력해주세요.")
             return
@@ -729,8 +562,7 @@ class MainWindow(QMainWindow):
         self.start_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.log_text.clear()
-        self.bot_thread = BotThread(id, pw, nickname, use_gemini, start_page, end_page, gemini_api_key)
-        self.bot_thread.log_signal.connect(self.append_log)
+        self.bot_thread = BotThread(id, pw, nickname, use_gemini, start_page, end_page, gemini_api_key, browserless, profile, resume, self.cbox_token_ttl)
         self.bot_thread.finished_signal.connect(self.bot_finished)
         self.bot_thread.start()
 
@@ -741,13 +573,26 @@ class MainWindow(QMainWindow):
             self.stop_btn.setEnabled(False)
 
     def append_log(self, msg):
-        self.log_text.append(msg)
-        self.log_text.ensureCursorVisible()
+        self.flush_logs()  # 작업 스레드가 먼저 남긴 로그가 이 줄보다 뒤에 나오지 않도록 먼저 비움
+        self.log_text.appendPlainText(msg)
+        get_file_logger().info(msg.strip('\n'))
+
+    def flush_logs(self):
+        if not self.bot_thread:
+            return
+        lines = self.bot_thread.take_logs()
+        if lines:
+            # 한 번에 붙여 다시 그리기를 한 번만 하도록 함
+            self.log_text.appendPlainText('\n'.join(lines))
 
     def bot_finished(self):
+        self.flush_logs()
         self.start_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
-        QMessageBox.information(self, "완료", "작업이 완료되었습니다.")
+        if self.bot_thread and self.bot_thread.is_stopped():
+            QMessageBox.information(self, "중지", "작업이 중지되었습니다.")
+        else:
+            QMessageBox.information(self, "완료", "작업이 완료되었습니다.")
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
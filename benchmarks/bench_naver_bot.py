@@ -0,0 +1,234 @@
+"""NaverBot 오프라인 벤치마크
+
+로컬 스텁 서버가 benchmarks/fixtures/의 응답으로 네이버 API(이웃새글 피드, PostView, cbox 토큰/목록/작성,
+좋아요 조회/요청)를 흉내 냅니다. 의도적인 대기(wait_random_time)를 뺀 채 process_pages를 N개의 가상 포스트에
+대해 실행하고, 포스트당 요청 수/바이트와 대기를 제외한 소요 시간을 보고합니다.
+
+    python benchmarks/bench_naver_bot.py --posts 50
+    python benchmarks/bench_naver_bot.py --posts 50 --gemini --json result.json
+"""
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import auto_reply
+import naver_core
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+# 이웃새글 피드 한 페이지의 포스트 수 (fetch_neighbor_feed도 페이지당 10개까지만 사용)
+POSTS_PER_PAGE = 10
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class StubState:
+    """스텁 서버가 보여줄 가상 포스트 목록과 경로별 요청 수/보낸 바이트를 보관합니다."""
+
+    def __init__(self, posts: int, post_view_kb: int):
+        self.posts = [(f'neighbor{i:04d}', str(223000000000 + i)) for i in range(posts)]
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.fixtures = {name: load_fixture(name) for name in ('cbox_token.json', 'cbox_list.json', 'cbox_create.json', 'like_reaction.json')}
+        # 실제 PostView처럼 본문 앞뒤에 큰 스크립트가 붙도록 fixture를 원하는 크기까지 채움
+        template = load_fixture('post_view.html').decode('utf-8')
+        padding_line = '<script type="text/javascript">var gnbConfig = {"menu": [' + ', '.join(['"item"'] * 40) + ']};</script>\n'
+        padding = padding_line * max(1, post_view_kb * 1024 // len(padding_line.encode('utf-8')) // 2)
+        self.post_view_template = template.replace('{head_scripts}', padding).replace('{tail_scripts}', padding)
+
+    def record(self, path: str, size: int) -> None:
+        with self.lock:
+            stats = self.requests.setdefault(path, {'count': 0, 'bytes': 0})
+            stats['count'] += 1
+            stats['bytes'] += size
+
+    def feed(self, page: int) -> bytes:
+        posts = self.posts[(page - 1) * POSTS_PER_PAGE:page * POSTS_PER_PAGE]
+        body = {'result': {'buddyPostList': [{'blogId': blog_id, 'logNo': log_no, 'postUrl': f'https://blog.naver.com/{blog_id}/{log_no}'} for blog_id, log_no in posts]}}
+        return (")]}'\n" + json.dumps(body, ensure_ascii=False)).encode('utf-8')
+
+    def post_view(self, blog_id: str, log_no: str) -> bytes:
+        blog_no = str(int(hashlib.md5(blog_id.encode('utf-8')).hexdigest()[:8], 16))
+        html = self.post_view_template.replace('{blog_id}', blog_id).replace('{log_no}', log_no).replace('{blog_no}', blog_no)
+        return html.encode('utf-8')
+
+    def like_search(self, query: str) -> bytes:
+        contents = [
+            {'contentsId': key, 'reactions': [{'reactionType': 'like', 'isReacted': False, 'count': 3}]}
+            for key in (part[len('BLOG['):-1] for part in query.split('|') if part.startswith('BLOG[') and part.endswith(']'))
+        ]
+        body = {'timestamp': str(int(time.time() * 1000)), 'guestToken': 'bench-guest-token', 'contents': contents}
+        return json.dumps(body).encode('utf-8')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # keep-alive를 지원해야 실제 서버처럼 연결 재사용 여부가 결과에 반영됨
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘이 켜져 있으면 요청마다 지연 ACK(~40ms)가 더해짐
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.route()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        self.route()
+
+    def route(self):
+        state = self.server.state
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        path = parts.path
+
+        if path == '/ajax/BuddyPostList.naver':
+            body = state.feed(int(query.get('page', 1)))
+        elif path == '/PostView.naver':
+            body = state.post_view(query.get('blogId', ''), query.get('logNo', ''))
+        elif path == '/commentBox/cbox/web_naver_token_jsonp.json':
+            body = state.fixtures['cbox_token.json']
+        elif path == '/commentBox/cbox/web_naver_list_json.json':
+            body = state.fixtures['cbox_list.json']
+        elif path == '/commentBox/cbox/web_naver_create_json.json':
+            body = state.fixtures['cbox_create.json']
+        elif path == '/blogserver/like/v1/search/contents':
+            body = state.like_search(query.get('q', ''))
+        elif path.startswith('/blogserver/like/v1/services/BLOG/contents/'):
+            body, path = state.fixtures['like_reaction.json'], '/blogserver/like/v1/services/BLOG/contents/{id}'
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8' if path == '/PostView.naver' else 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionError:
+            pass
+        state.record(path, len(body))
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # PostView는 필요한 부분만 읽고 연결을 닫으므로 연결 끊김은 오류로 보지 않음
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class StubModel:
+    """Gemini 대신 즉시 댓글을 돌려주는 모델, 네트워크 없이 댓글 생성 경로만 실행합니다."""
+
+    class Response:
+        text = "벤치마크용 댓글입니다. 잘 읽었습니다!"
+
+    def generate_content(self, prompt):
+        return self.Response()
+
+
+def run_benchmark(posts: int, post_view_kb: int, use_gemini: bool, verbose: bool) -> dict:
+    server = StubServer(('127.0.0.1', 0), StubHandler)
+    server.state = StubState(posts, post_view_kb)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # 실제 사용자 데이터(DB, 세션, 실행 통계)를 건드리지 않도록 경로를 임시 폴더로 바꿈
+            naver_core.DB_PATH = os.path.join(temp_dir, 'auto_reply.db')
+            naver_core.SESSION_PATH = os.path.join(temp_dir, 'session.json')
+            naver_core.METRICS_DIR = os.path.join(temp_dir, 'run_metrics')
+            naver_core.CHECKPOINT_PATH = os.path.join(temp_dir, 'checkpoint.json')
+
+            bot = auto_reply.NaverBot('bench', 'bench', 'bench', use_gemini, math.ceil(posts / POSTS_PER_PAGE))
+            bot.BLOG_URL = bot.APIS_URL = bot.SECTION_URL = base_url
+            # 의도적인 대기는 빼고 코드 경로의 소요 시간만 잼
+            bot.wait_random_time = lambda min_seconds, max_seconds: None
+            if use_gemini:
+                bot._model = StubModel()
+
+            output = io.StringIO()
+            with contextlib.redirect_stdout(sys.stdout if verbose else output):
+                started = time.perf_counter()
+                bot.process_pages()
+                elapsed = time.perf_counter() - started
+            summary = bot.metrics.summary()
+            bot.session.close()
+            bot.ledger.conn.close()
+            bot.blog_no_index.conn.close()
+            bot.comment_cache.conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return {
+        'posts': posts,
+        'post_view_kb': post_view_kb,
+        'gemini': use_gemini,
+        'elapsed': round(elapsed, 4),
+        'ms_per_post': round(elapsed * 1000 / posts, 3),
+        'client_requests_per_post': round(summary['total_requests'] / posts, 3),
+        'client_bytes_per_post': round(summary['total_bytes'] / posts),
+        'server_requests_per_post': round(sum(stats['count'] for stats in server.state.requests.values()) / posts, 3),
+        'server_bytes_per_post': round(sum(stats['bytes'] for stats in server.state.requests.values()) / posts),
+        'server_requests': server.state.requests,
+        'client_requests': summary['requests'],
+        'stages': summary['stages'],
+    }
+
+
+def print_report(result: dict) -> None:
+    posts = result['posts']
+    print(f"\n=== NaverBot 벤치마크: 포스트 {posts}개, PostView {result['post_view_kb']}KB, {'Gemini(스텁)' if result['gemini'] else '템플릿'} 댓글 ===")
+    print(f"소요 시간 (대기 제외): {result['elapsed']:.3f}초, 포스트당 {result['ms_per_post']:.2f}ms")
+    print(f"포스트당 요청 수: {result['client_requests_per_post']:.2f}회, 읽은 바이트: {result['client_bytes_per_post'] / 1024:.1f}KB "
+          f"(서버가 보낸 바이트: {result['server_bytes_per_post'] / 1024:.1f}KB)")
+
+    print("\n엔드포인트별 (요청 수 / 포스트당 / 서버가 보낸 KB)")
+    for path, stats in sorted(result['server_requests'].items(), key=lambda item: -item[1]['count']):
+        print(f"  {path}: {stats['count']} / {stats['count'] / posts:.2f} / {stats['bytes'] / 1024:.1f}")
+
+    print("\n단계별 (횟수 / p50 ms / p95 ms)")
+    for name, stats in result['stages'].items():
+        print(f"  {name}: {stats['count']} / {stats['p50'] * 1000:.2f} / {stats['p95'] * 1000:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 스텁 서버로 NaverBot.process_pages의 처리량을 잽니다.")
+    parser.add_argument('--posts', type=int, default=50, help="처리할 가상 포스트 수 (기본 50)")
+    parser.add_argument('--post-view-kb', type=int, default=200, help="PostView 응답 크기 KB (기본 200)")
+    parser.add_argument('--gemini', action='store_true', help="스텁 모델로 Gemini 댓글 경로(본문 추출 포함)를 실행")
+    parser.add_argument('--json', metavar='PATH', help="결과를 JSON으로 저장해 다른 실행과 비교")
+    parser.add_argument('--verbose', action='store_true', help="봇 출력을 그대로 보여줌")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.posts, args.post_view_kb, args.gemini, args.verbose)
+    print_report(result)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1718 @@
+"""auto_reply.py(CLI)와 auto_reply_gui.py(GUI)가 함께 쓰는 부분
+
+화면과 관계없는 로컬 저장소(blogNo 인덱스, 처리 장부, 댓글 캐시, 체크포인트), 실행 통계/프로파일러,
+HTTP 계층(타임아웃/재시도/회로 차단기)과 네이버 API 호출을 모아 둡니다. 브라우저 로그인과 실행 루프는
+각 진입점의 NaverBot이 NaverClient를 상속해 구현합니다.
+"""
+import os
+import re
+import time
+import json
+import random
+import sqlite3
+import hashlib
+import codecs
+import math
+import functools
+import email.utils
+import threading
+import queue
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError, wait as wait_futures
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from typing import Optional, Dict, Tuple, List
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+# 로컬 데이터(블로그 번호 인덱스 등)를 저장할 SQLite 파일, settings.json과 같은 폴더에 둔다
+DB_PATH = os.path.join(os.path.dirname(__file__), "auto_reply.db")
+# 로그인 후 쿠키를 저장해 두고 다음 실행에서 재사용할 파일
+SESSION_PATH = os.path.join(os.path.dirname(__file__), "session.json")
+# 실행이 끝날 때마다 단계별 소요 시간/요청 통계 요약(JSON)을 남길 폴더
+METRICS_DIR = os.path.join(os.path.dirname(__file__), "run_metrics")
+# 프로파일 모드 실행 결과를 실행 시각별 하위 폴더에 남길 폴더
+PROFILES_DIR = os.path.join(os.path.dirname(__file__), "profiles")
+# 중단된 실행을 이어서 할 수 있도록 진행 상황을 저장하는 파일, 끝까지 처리하면 지운다
+CHECKPOINT_PATH = os.path.join(os.path.dirname(__file__), "checkpoint.json")
+
+
+class BlogNoIndex:
+    """blogId → blogNo 매핑을 SQLite에 영구 저장합니다."""
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS blog_no (blog_id TEXT PRIMARY KEY, blog_no TEXT NOT NULL)")
+        self.conn.commit()
+
+        # 시작 시 전체 인덱스를 메모리로 읽어 둠
+        self.blog_nos = dict(self.conn.execute("SELECT blog_id, blog_no FROM blog_no"))
+
+    def get(self, blog_id: str) -> Optional[str]:
+        return self.blog_nos.get(blog_id)
+
+    def set(self, blog_id: str, blog_no: str) -> None:
+        if self.blog_nos.get(blog_id) == blog_no:
+            return
+        with self.lock:
+            self.blog_nos[blog_id] = blog_no
+            self.conn.execute("INSERT OR REPLACE INTO blog_no (blog_id, blog_no) VALUES (?, ?)", (blog_id, blog_no))
+            self.conn.commit()
+
+
+class PostLedger:
+    """(blog_id, logNo)별 좋아요/댓글 처리 결과를 SQLite에 기록합니다."""
+
+    def __init__(self, path: str):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_posts ("
+            "blog_id TEXT NOT NULL, log_no TEXT NOT NULL, "
+            "liked_at TEXT, like_result TEXT, commented_at TEXT, comment_result TEXT, "
+            "PRIMARY KEY (blog_id, log_no))"
+        )
+        self.conn.commit()
+
+    def get(self, blog_id: str, log_no: str) -> Optional[Dict[str, Optional[str]]]:
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT liked_at, like_result, commented_at, comment_result FROM processed_posts WHERE blog_id = ? AND log_no = ?",
+                (blog_id, log_no)
+            ).fetchone()
+        if not row:
+            return None
+        return dict(zip(('liked_at', 'like_result', 'commented_at', 'comment_result'), row))
+
+    def mark_liked(self, blog_id: str, log_no: str, result: str) -> None:
+        self._mark(blog_id, log_no, 'liked_at', 'like_result', result)
+
+    def mark_commented(self, blog_id: str, log_no: str, result: str) -> None:
+        self._mark(blog_id, log_no, 'commented_at', 'comment_result', result)
+
+    def _mark(self, blog_id: str, log_no: str, time_column: str, result_column: str, result: str) -> None:
+        now = time.strftime('%Y-%m-%d %H:%M:%S')
+        with self.lock:
+            self.conn.execute(
+                f"INSERT INTO processed_posts (blog_id, log_no, {time_column}, {result_column}) VALUES (?, ?, ?, ?) "
+                f"ON CONFLICT (blog_id, log_no) DO UPDATE SET {time_column} = excluded.{time_column}, {result_column} = excluded.{result_column}",
+                (blog_id, log_no, now, result)
+            )
+            self.conn.commit()
+
+
+class PostTextExtractor(HTMLParser):
+    """PostView HTML에서 본문 컨테이너의 텍스트만 모으고, 충분히 모이면 done을 세웁니다.
+
+    전체 DOM 트리를 만들지 않으므로 이미지/스크립트가 많은 긴 글에서도 CPU와 메모리를 적게 씁니다.
+    """
+
+    # 우선순위 순서의 본문 컨테이너 (div class, div id)
+    CONTAINERS = (('se-main-container', 'class'), ('postViewArea', 'id'))
+
+    def __init__(self, limit: int):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.texts = {name: [] for name, _ in self.CONTAINERS}
+        self.lengths = {name: 0 for name, _ in self.CONTAINERS}
+        self.open_depths = {}  # 현재 열려 있는 컨테이너별 div 중첩 깊이
+        self.finished = set()
+        self.skip_depth = 0  # script/style 안의 텍스트는 제외
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('script', 'style'):
+            self.skip_depth += 1
+        # 닫는 태그를 생략하는 p/li/td 등이 많으므로 컨테이너의 끝은 div 깊이로만 판단
+        if tag != 'div':
+            return
+        for name in self.open_depths:
+            self.open_depths[name] += 1
+        attrs = dict(attrs)
+        for name, attr in self.CONTAINERS:
+            if name in self.open_depths or name in self.finished:
+                continue
+            values = (attrs.get(attr) or '').split() if attr == 'class' else [attrs.get(attr)]
+            if name in values:
+                self.open_depths[name] = 1
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in ('script', 'style') and self.skip_depth:
+            self.skip_depth -= 1
+        if tag != 'div':
+            return
+        for name in list(self.open_depths):
+            self.open_depths[name] -= 1
+            if self.open_depths[name] <= 0:
+                del self.open_depths[name]
+                self.finished.add(name)
+        self.check_done()
+
+    def handle_data(self, data):
+        if not self.open_depths or self.skip_depth:
+            return
+        text = data.strip()
+        if not text:
+            return
+        for name in self.open_depths:
+            if self.lengths[name] < self.limit:
+                self.texts[name].append(text)
+                self.lengths[name] += len(text) + 1
+        self.check_done()
+
+    def check_done(self):
+        """text가 돌려줄 컨테이너(우선순위가 가장 높고 시작된 것)가 닫혔거나 limit만큼 모였으면 done을 세웁니다."""
+        for name, _ in self.CONTAINERS:
+            if name in self.finished or self.lengths[name] >= self.limit:
+                self.done = True
+                return
+            if name in self.open_depths:
+                return
+
+    @property
+    def text(self) -> Optional[str]:
+        for name, _ in self.CONTAINERS:
+            if self.texts[name]:
+                return ' '.join(self.texts[name])[:self.limit]
+        return None
+
+
+class CommentCache:
+    """본문 해시(+프롬프트 버전)별로 생성된 댓글을 SQLite에 저장하고, 오래 안 쓴 항목부터 지웁니다."""
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE IF NOT EXISTS comment_cache (key TEXT PRIMARY KEY, comment TEXT NOT NULL, last_used REAL NOT NULL)")
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT comment FROM comment_cache WHERE key = ?", (key,)).fetchone()
+            if row:
+                self.conn.execute("UPDATE comment_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+                self.conn.commit()
+        return row[0] if row else None
+
+    def put(self, key: str, comment: str) -> None:
+        with self.lock:
+            self.conn.execute("INSERT OR REPLACE INTO comment_cache (key, comment, last_used) VALUES (?, ?, ?)", (key, comment, time.time()))
+            # 최근 사용한 max_entries개만 남김
+            self.conn.execute(
+                "DELETE FROM comment_cache WHERE key IN (SELECT key FROM comment_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+
+class RunCheckpoint:
+    """중단된 실행을 이어서 할 수 있도록 수집을 마친 페이지, 마지막으로 처리한 포스트, 아직 처리하지 않은 포스트를 JSON 파일에 저장합니다."""
+
+    def __init__(self, path: str, account_id: str):
+        self.path = path
+        self.account_id = account_id
+        self.lock = threading.Lock()
+        self.discovered_page = 0  # 이웃새글 목록을 받아 pending에 모두 넣은 마지막 페이지
+        self.feed_exhausted = False  # end_page 전에 빈 페이지가 나와 더 수집할 글이 없음
+        self.current_page = None
+        self.last_log_no = None
+        self.pending = OrderedDict()  # (blogId, logNo) → 수집했지만 아직 좋아요/댓글을 하지 않은 포스트
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if saved.get('id') != self.account_id:
+            return False
+        with self.lock:
+            self.discovered_page = saved.get('discovered_page', 0)
+            self.feed_exhausted = saved.get('feed_exhausted', False)
+            self.current_page = saved.get('current_page')
+            self.last_log_no = saved.get('last_log_no')
+            self.pending = OrderedDict(((post['blog_id'], post['blog_post_id']), post) for post in saved.get('pending', []))
+        return True
+
+    def add(self, items: List[Dict], discovered_page: Optional[int] = None) -> bool:
+        with self.lock:
+            for item in items:
+                self.pending[(item['blog_id'], item['blog_post_id'])] = item
+            if discovered_page is not None:
+                self.discovered_page = max(self.discovered_page, discovered_page)
+        return self.save()
+
+    def mark_exhausted(self) -> bool:
+        with self.lock:
+            self.feed_exhausted = True
+        return self.save()
+
+    def done(self, item: Dict) -> bool:
+        with self.lock:
+            self.pending.pop((item['blog_id'], item['blog_post_id']), None)
+            self.current_page = item['page']
+            self.last_log_no = item['blog_post_id']
+        return self.save()
+
+    def is_complete(self, end_page: int) -> bool:
+        with self.lock:
+            return (self.discovered_page >= end_page or self.feed_exhausted) and not self.pending
+
+    def save(self) -> bool:
+        with self.lock:
+            data = {
+                'id': self.account_id,
+                'saved_at': time.time(),
+                'discovered_page': self.discovered_page,
+                'feed_exhausted': self.feed_exhausted,
+                'current_page': self.current_page,
+                'last_log_no': self.last_log_no,
+                'pending': [self.serialize(item) for item in self.pending.values()],
+            }
+            try:
+                # 좋아요 토큰이 들어 있으므로 세션 파일처럼 소유자만 읽을 수 있게 쓰고, 다 쓴 뒤 한 번에 교체
+                temp_path = self.path + '.tmp'
+                fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+                return True
+            except OSError:
+                return False
+
+    def remove(self) -> None:
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+    @staticmethod
+    def serialize(item: Dict) -> Dict:
+        prepared = item.get('prepared')
+        if isinstance(prepared, Future):
+            # 준비가 끝난 댓글 확인/생성 결과만 저장하고, 나머지는 이어서 실행할 때 다시 준비
+            prepared = prepared.result() if prepared.done() and not prepared.cancelled() and prepared.exception() is None else None
+        return {'page': item['page'], 'blog_id': item['blog_id'], 'blog_post_id': item['blog_post_id'], 'like_state': item.get('like_state'), 'prepared': prepared}
+
+
+class RunMetrics:
+    """한 번 실행하는 동안의 단계별 소요 시간과 엔드포인트별 요청 수/바이트를 모아 요약합니다."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+        self.timings = {}
+        self.requests = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """with 블록의 실행 시간을 name 단계에 기록합니다."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - started)
+
+    def add_timing(self, name: str, seconds: float) -> None:
+        with self.lock:
+            self.timings.setdefault(name, []).append(seconds)
+
+    def endpoint(self, url: str) -> str:
+        """URL에서 쿼리와 포스트별 경로를 떼어 엔드포인트 이름으로 만듭니다."""
+        parts = urlsplit(url)
+        return parts.netloc + re.sub(r'/contents/[^/]+$', '/contents/{id}', parts.path)
+
+    def add_request(self, url: str, status_code: Optional[int], size: int) -> None:
+        with self.lock:
+            stats = self.requests.setdefault(self.endpoint(url), {'count': 0, 'bytes': 0, 'errors': 0})
+            stats['count'] += 1
+            stats['bytes'] += size
+            if status_code is None or status_code >= 400:
+                stats['errors'] += 1
+
+    def add_bytes(self, url: str, size: int) -> None:
+        """스트리밍으로 읽은 응답처럼 요청 시점에 크기를 모르는 경우 나중에 더합니다."""
+        with self.lock:
+            stats = self.requests.setdefault(self.endpoint(url), {'count': 0, 'bytes': 0, 'errors': 0})
+            stats['bytes'] += size
+
+    @staticmethod
+    def percentile(values: List[float], q: float) -> float:
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+    def summary(self) -> Dict:
+        with self.lock:
+            stages = {
+                name: {
+                    'count': len(values),
+                    'total': round(sum(values), 4),
+                    'p50': round(self.percentile(values, 0.5), 4),
+                    'p95': round(self.percentile(values, 0.95), 4),
+                    'max': round(max(values), 4),
+                }
+                for name, values in self.timings.items()
+            }
+            requests_by_endpoint = {name: dict(stats) for name, stats in self.requests.items()}
+        return {
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self.started_at)),
+            'duration': round(time.time() - self.started_at, 3),
+            'stages': stages,
+            'requests': requests_by_endpoint,
+            'total_requests': sum(stats['count'] for stats in requests_by_endpoint.values()),
+            'total_bytes': sum(stats['bytes'] for stats in requests_by_endpoint.values()),
+        }
+
+    def prometheus_text(self, summary: Dict) -> str:
+        lines = [
+            '# HELP auto_reply_stage_seconds Per-stage latency of the last run',
+            '# TYPE auto_reply_stage_seconds summary',
+        ]
+        for name, stats in summary['stages'].items():
+            lines.append(f'auto_reply_stage_seconds{{stage="{name}",quantile="0.5"}} {stats["p50"]}')
+            lines.append(f'auto_reply_stage_seconds{{stage="{name}",quantile="0.95"}} {stats["p95"]}')
+            lines.append(f'auto_reply_stage_seconds_sum{{stage="{name}"}} {stats["total"]}')
+            lines.append(f'auto_reply_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+        for metric, key in (('auto_reply_requests', 'count'), ('auto_reply_response_bytes', 'bytes'), ('auto_reply_request_errors', 'errors')):
+            lines.append(f'# TYPE {metric} gauge')
+            for name, stats in summary['requests'].items():
+                lines.append(f'{metric}{{endpoint="{name}"}} {stats[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, directory: str, prometheus_path: Optional[str] = None) -> str:
+        """요약을 directory에 JSON으로 저장하고, prometheus_path가 있으면 textfile 형식으로도 씁니다."""
+        summary = self.summary()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, time.strftime('run-%Y%m%d-%H%M%S.json', time.localtime(self.started_at)))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+        if prometheus_path:
+            # textfile 수집기가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            temp_path = prometheus_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text(summary))
+            os.replace(temp_path, prometheus_path)
+        return path
+
+
+class RunProfiler:
+    """프로파일 모드에서 CPU(cProfile), 페이지별 메모리(tracemalloc), 파이썬/크롬 프로세스 RSS를 기록합니다."""
+
+    TOP_STATS = 30
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.profiler = None
+        self.thread_profilers = []  # profile_thread로 감싼 작업이 끝날 때마다 모아 두었다가 stop에서 합침
+        self.thread_lock = threading.Lock()
+        self.previous_snapshot = None
+        self.rss_samples = []
+
+    def start(self) -> None:
+        import cProfile
+        import tracemalloc
+
+        os.makedirs(self.directory, exist_ok=True)
+        tracemalloc.start(10)
+        self.sample_rss('start')
+        # cProfile은 활성화한 스레드만 기록하므로 여기서는 process_pages(작성) 스레드를 기록하고,
+        # 수집 스레드와 enrich 작업자의 작업은 profile_thread로 감싸 따로 기록한 뒤 stop에서 합침
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+
+    def profile_thread(self, func):
+        """func를 실행하는 스레드에서 별도의 cProfile로 기록하고, 끝나면 결과를 stop에서 합치도록 모아 둡니다."""
+        import cProfile
+
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12부터는 cProfile 하나가 모든 스레드를 기록하고 동시에 둘을 켤 수 없음
+                return func(*args, **kwargs)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.disable()
+                with self.thread_lock:
+                    self.thread_profilers.append(profiler)
+        return run
+
+    def page_done(self, page: int) -> None:
+        """페이지가 끝날 때마다 메모리 상위 항목과 직전 페이지 대비 증가분을 저장합니다."""
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ])
+        with open(os.path.join(self.directory, f'memory_page{page}.txt'), 'w', encoding='utf-8') as f:
+            current, peak = tracemalloc.get_traced_memory()
+            f.write(f'traced: {current / 1024:.0f}KB (peak {peak / 1024:.0f}KB)\n\n')
+            f.write(f'== 할당 위치 상위 {self.TOP_STATS}개 ==\n')
+            for stat in snapshot.statistics('lineno')[:self.TOP_STATS]:
+                f.write(f'{stat}\n')
+            if self.previous_snapshot:
+                f.write(f'\n== 직전 페이지 대비 증가 상위 {self.TOP_STATS}개 ==\n')
+                for stat in snapshot.compare_to(self.previous_snapshot, 'lineno')[:self.TOP_STATS]:
+                    f.write(f'{stat}\n')
+        self.previous_snapshot = snapshot
+        self.sample_rss(f'page{page}')
+
+    def stop(self) -> None:
+        """모든 스레드의 CPU 프로파일을 합쳐 누적/자체 시간순으로 정렬해 저장하고 RSS 기록을 씁니다.
+
+        stop 시점에 아직 끝나지 않은 수집/enrich 작업은 보고서에 들어가지 않습니다.
+        """
+        import pstats
+        import tracemalloc
+
+        if self.profiler:
+            self.profiler.disable()
+            with self.thread_lock:
+                thread_profilers, self.thread_profilers = self.thread_profilers, []
+            stats = pstats.Stats(self.profiler, *thread_profilers)
+            stats.dump_stats(os.path.join(self.directory, 'cpu.prof'))
+            for sort_key in ('cumulative', 'tottime'):
+                with open(os.path.join(self.directory, f'cpu_{sort_key}.txt'), 'w', encoding='utf-8') as f:
+                    stats.stream = f
+                    stats.sort_stats(sort_key).print_stats(50)
+            self.profiler = None
+        self.sample_rss('end')
+        tracemalloc.stop()
+        self.previous_snapshot = None
+        with open(os.path.join(self.directory, 'rss.json'), 'w', encoding='utf-8') as f:
+            json.dump(self.rss_samples, f, ensure_ascii=False, indent=2)
+
+    def sample_rss(self, label: str) -> None:
+        """현재 프로세스와 크롬(크롬드라이버 포함) 자식 프로세스의 RSS를 /proc에서 읽어 기록합니다."""
+        import gc
+
+        chrome_pids = [pid for pid in self.child_pids(os.getpid()) if 'chrome' in self.read_comm(pid).lower()]
+        self.rss_samples.append({
+            'label': label,
+            'time': round(time.time(), 3),
+            'python_rss_kb': self.read_rss_kb('self'),
+            'chrome_rss_kb': sum(self.read_rss_kb(pid) or 0 for pid in chrome_pids) if chrome_pids else None,
+            'chrome_processes': len(chrome_pids),
+            # 세션이 새로 만들어지고 해제되지 않는지 확인하기 위한 살아 있는 requests.Session 개수
+            # (gc.get_objects()는 모든 객체의 __dict__를 만들어 메모리 측정값을 부풀리므로 클래스 참조로 셈)
+            'live_sessions': sum(1 for obj in gc.get_referrers(requests.Session) if isinstance(obj, requests.Session)),
+        })
+
+    @staticmethod
+    def read_rss_kb(pid) -> Optional[int]:
+        try:
+            with open(f'/proc/{pid}/status', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
+
+    @staticmethod
+    def read_comm(pid: int) -> str:
+        try:
+            with open(f'/proc/{pid}/comm', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return ''
+
+    @staticmethod
+    def child_pids(root: int) -> List[int]:
+        """/proc을 훑어 root의 모든 자손 프로세스 번호를 찾습니다. /proc이 없으면(Windows/macOS) 빈 목록입니다."""
+        parents = {}
+        try:
+            entries = os.listdir('/proc')
+        except OSError:
+            return []
+        for entry in entries:
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', encoding='utf-8') as f:
+                    # comm에 공백이나 괄호가 있을 수 있어 마지막 ')' 뒤에서 필드를 읽음
+                    fields = f.read().rsplit(')', 1)[1].split()
+                parents[int(entry)] = int(fields[1])
+            except (OSError, IndexError, ValueError):
+                continue
+        children, queue = [], [root]
+        while queue:
+            parent = queue.pop()
+            for pid, ppid in parents.items():
+                if ppid == parent:
+                    children.append(pid)
+                    queue.append(pid)
+        return children
+
+
+class CircuitBreaker:
+    """엔드포인트별 연속 실패 수를 세어, 계속 실패하는 엔드포인트에는 잠시 요청을 보내지 않도록 합니다."""
+
+    def __init__(self, failure_threshold: int, open_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.lock = threading.Lock()
+        self.failures = {}  # 엔드포인트 → 연속 실패 수
+        self.open_until = {}  # 엔드포인트 → 다시 요청해도 되는 시각 (time.monotonic 기준)
+
+    def remaining(self, endpoint: str) -> float:
+        with self.lock:
+            return max(0.0, self.open_until.get(endpoint, 0) - time.monotonic())
+
+    def record_success(self, endpoint: str) -> None:
+        with self.lock:
+            self.failures.pop(endpoint, None)
+            self.open_until.pop(endpoint, None)
+
+    def record_failure(self, endpoint: str) -> bool:
+        with self.lock:
+            self.failures[endpoint] = self.failures.get(endpoint, 0) + 1
+            if self.failures[endpoint] < self.failure_threshold:
+                return False
+        self.open(endpoint, self.open_seconds)
+        return True
+
+    def open(self, endpoint: str, seconds: float) -> None:
+        with self.lock:
+            self.open_until[endpoint] = max(self.open_until.get(endpoint, 0), time.monotonic() + seconds)
+            # 멈춘 시간이 지난 뒤 첫 요청이 다시 실패하면 바로 다시 멈춤
+            self.failures[endpoint] = self.failure_threshold - 1
+
+
+def timed(stage: str):
+    """메서드 실행 시간을 self.metrics의 stage 단계에 기록하는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.stage(stage):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class NaverClient:
+    """네이버 블로그 API 호출과 이웃새글 파이프라인의 화면과 무관한 부분, 브라우저 관련 메서드(initialize_driver, login,
+    get_neighbor_blogs_from_browser)와 process_pages는 상속한 NaverBot이 구현합니다."""
+    # 실행 중 보관할 PostView 파싱 결과 최대 개수
+    POST_VIEW_CACHE_SIZE = 64
+    # Gemini API 토큰 제한을 고려한 본문 최대 길이
+    POST_TEXT_LIMIT = 2000
+    BLOG_NO_PATTERN = re.compile(r"blogNo\s*=\s*'(\d+)'")
+    # 댓글 목록을 확인할 때 한 번에 받을 댓글 수와 최대 페이지 수
+    COMMENT_PAGE_SIZE = 20
+    COMMENT_SCAN_MAX_PAGES = 10
+    # 좋아요/댓글 작성보다 미리 찾아 둘 포스트 수(수집 큐 크기)와, 그 포스트들의
+    # blogNo/댓글 확인/본문/Gemini 댓글을 미리 준비하는 작업자 수
+    PIPELINE_DEPTH = 4
+    ENRICH_WORKERS = 2
+    # 댓글 프롬프트를 바꾸면 올려서 예전 프롬프트로 만든 캐시 댓글을 쓰지 않도록 함
+    PROMPT_VERSION = 1
+    COMMENT_CACHE_SIZE = 500
+    # cbox_token 재사용 시간(초), 만료되거나 거절되면 새로 받음
+    CBOX_TOKEN_TTL = 600
+    # 좋아요 상태를 한 번에 조회할 포스트 수 (이웃새글 한 페이지가 한 번에 들어가도록)
+    LIKE_BATCH_SIZE = 20
+    # 네이버 서버 주소, 벤치마크에서는 로컬 스텁 서버 주소로 바꿔 끼움
+    BLOG_URL = 'https://blog.naver.com'
+    APIS_URL = 'https://apis.naver.com'
+    SECTION_URL = 'https://section.blog.naver.com'
+    # BlogHome 이웃새글 화면이 내부적으로 호출하는 JSON API
+    FEED_PATH = '/ajax/BuddyPostList.naver'
+    # 저장된 세션 확인용 주소, 로그인 여부에 따라 리다이렉트 대상이 다름
+    SESSION_CHECK_PATH = '/MyBlog.naver'
+    # 엔드포인트별 (연결, 읽기) 타임아웃(초), 목록에 없는 엔드포인트는 REQUEST_TIMEOUT
+    REQUEST_TIMEOUT = (5, 10)
+    REQUEST_TIMEOUTS = {
+        '/PostView.naver': (5, 20),  # 큰 HTML을 스트리밍으로 받음
+        '/commentBox/cbox/web_naver_create_json.json': (5, 20),  # 재시도하지 않으므로 넉넉하게
+    }
+    # 일시적인 오류의 재시도 횟수와 지수 백오프(초), Retry-After가 RETRY_MAX_DELAY보다 길면 그동안 엔드포인트를 멈춤
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 1
+    RETRY_MAX_DELAY = 30
+    # 한 엔드포인트가 연속으로 이만큼 실패하면 CIRCUIT_OPEN_SECONDS 동안 그 엔드포인트로 요청을 보내지 않음
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_OPEN_SECONDS = 60
+    CIRCUIT_MAX_PAUSE = 600
+    GEMINI_TIMEOUT = 30  # google-generativeai 0.3.2는 요청 타임아웃 인자가 없어 run_with_timeout으로 제한
+    # 이웃새글 카드의 링크/제목/작성자를 한 번의 WebDriver 호출로 모두 꺼내는 스크립트
+    EXTRACT_POST_CARDS_JS = """
+        return Array.from(arguments[0].querySelectorAll(arguments[1])).map(function (item) {
+            var link = item.querySelector('a.desc_inner');
+            var title = item.querySelector('.title_post');
+            var author = item.querySelector('.name_author');
+            return {
+                href: link ? link.href : null,
+                title: title ? title.textContent.trim() : '',
+                author: author ? author.textContent.trim() : ''
+            };
+        });
+    """
+
+    def __init__(self, id: str, pw: str, nickname: str, use_gemini: bool, start_page: int, end_page: int,
+                 log_callback=None, stop_flag=None, gemini_api_key: Optional[str] = None, browserless: bool = True,
+                 cbox_token_ttl: Optional[float] = None, profile: bool = False, resume: bool = False):
+        load_dotenv()
+        self.gemini_api_key = gemini_api_key or os.getenv('GEMINI_API_KEY')
+        self.headers = {
+            'accept': '*/*',
+            'accept-encoding': 'gzip, deflate, br, zstd',
+            'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+        }
+        self.driver = None
+        # 단계별 소요 시간/요청 통계, AUTO_REPLY_PROM_FILE을 지정하면 Prometheus textfile로도 씀
+        self.metrics = RunMetrics()
+        self.prometheus_textfile = os.getenv('AUTO_REPLY_PROM_FILE')
+        self.session = self.create_session()
+        self.post_view_cache = OrderedDict()
+        self.post_view_lock = threading.Lock()
+        self.blog_no_index = BlogNoIndex(DB_PATH)
+        self.ledger = PostLedger(DB_PATH)
+        self.comment_cache = CommentCache(DB_PATH, self.COMMENT_CACHE_SIZE)
+        self.user_id_no = None
+        # 연속으로 실패하는 엔드포인트를 잠시 멈추는 회로 차단기
+        self.circuit = CircuitBreaker(self.CIRCUIT_FAILURE_THRESHOLD, self.CIRCUIT_OPEN_SECONDS)
+        # 실행 중 세션이 만료되면 여러 작업자가 동시에 다시 로그인하지 않도록 함, 다시 로그인하지 못하면 session_expired로 작업을 멈춤
+        self.login_lock = threading.Lock()
+        self.session_expired = False
+        # cbox_token 캐시, 재사용 시간은 인자나 AUTO_REPLY_CBOX_TOKEN_TTL(초)로 바꿀 수 있음
+        # 포스트마다 다른 토큰인지는 캐시된 토큰을 다른 포스트에 써 보고 거절되는지로 측정 (None: 아직 모름)
+        self.cbox_token_ttl = cbox_token_ttl if cbox_token_ttl is not None else self.read_cbox_token_ttl()
+        self.cbox_token = None  # {'token', 'object_id', 'fetched_at'}
+        self.cbox_token_per_object = None
+        self.use_http_feed = True  # False면 항상 브라우저로 이웃새글을 가져옴
+        self.browserless = browserless  # 저장된 세션이 유효하면 크롬 없이 HTTP로만 실행 (메모리 절약)
+        self._model = None  # Gemini 댓글을 처음 생성할 때 만듦 (self.model 참고)
+        self.enrich_executor = None  # 댓글 미리 준비용 백그라운드 작업자 (process_pages 실행 중에만 있음)
+        self.comment_templates = [
+            "좋은 글 잘 읽었습니다. 감사합니다!",
+            "유익한 정보 감사합니다. 잘 보고 갑니다!",
+            "정말 도움이 되는 글이네요. 공감합니다!",
+            "글 잘 읽었습니다. 다음 글도 기대됩니다!",
+            "좋은 정보 공유해주셔서 감사합니다!"
+        ]
+        self.current_template_index = 0
+        self.id = id
+        self.pw = pw
+        self.nickname = nickname
+        self.use_gemini = use_gemini
+        self.start_page = start_page
+        self.end_page = end_page
+        self.log_callback = log_callback  # 없으면 print
+        self.stop_flag = stop_flag  # threading.Event, 세우면 대기/재시도가 바로 끝남
+        # 프로파일 모드면 profiles/<실행 시각>/ 폴더에 CPU/메모리 보고서를 남김
+        self.profiler = RunProfiler(os.path.join(PROFILES_DIR, time.strftime('%Y%m%d-%H%M%S'))) if profile else None
+        # 진행 상황 체크포인트, resume이면 남은 포스트부터 처리하고 수집을 마친 다음 페이지부터 이어서 수집
+        self.checkpoint = RunCheckpoint(CHECKPOINT_PATH, id)
+        self.resume = resume
+
+    def log(self, msg):
+        if self.log_callback:
+            self.log_callback(msg)
+        else:
+            print(msg)
+
+    def should_stop(self):
+        return self.stop_flag and self.stop_flag.is_set()
+
+    def sleep(self, seconds: float) -> bool:
+        """중지 요청이 들어오면 바로 깨어나는 대기, 중지되었으면 True를 돌려줍니다."""
+        if self.stop_flag:
+            return self.stop_flag.wait(seconds)
+        time.sleep(seconds)
+        return False
+
+    def wait_for_future(self, future):
+        """미리 걸어 둔 작업의 결과를 기다리되 중지 요청이 들어오면 None을 돌려줍니다."""
+        while True:
+            try:
+                return future.result(timeout=0.5)
+            except FutureTimeoutError:
+                if self.should_stop():
+                    return None
+
+    def run_with_timeout(self, func, *args, timeout: float):
+        """func를 데몬 스레드에서 실행하고 timeout초가 지나거나 중지 요청이 들어오면 기다리지 않고 TimeoutError를 냅니다."""
+        future = Future()
+        def call():
+            try:
+                future.set_result(func(*args))
+            except Exception as e:
+                future.set_exception(e)
+        threading.Thread(target=call, name='timeout-call', daemon=True).start()
+        deadline = time.monotonic() + timeout
+        while not future.done():
+            if self.should_stop():
+                raise TimeoutError("작업이 중지되어 응답을 기다리지 않습니다.")
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"{timeout}초 안에 응답이 없습니다.")
+            wait_futures([future], timeout=0.5)
+        return future.result()
+
+    def profiled(self, func):
+        """프로파일 모드면 func를 실행하는 스레드(수집 스레드, enrich 작업자)도 CPU 프로파일에 포함되도록 감쌉니다."""
+        return self.profiler.profile_thread(func) if self.profiler else func
+
+    @property
+    def model(self):
+        """Gemini 모델을 처음 사용할 때 google.generativeai를 불러와 생성합니다."""
+        if self._model is None:
+            import google.generativeai as genai
+            if self.gemini_api_key:
+                genai.configure(api_key=self.gemini_api_key)
+            self._model = genai.GenerativeModel('gemini-2.0-flash')
+        return self._model
+
+    def save_session(self) -> None:
+        """로그인 쿠키를 계정 정보와 함께 SESSION_PATH에 저장합니다. (소유자만 읽기/쓰기 가능)"""
+        if not self.session.cookies.get('NID_AUT'):
+            return
+        cookies = [
+            {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path, 'expires': c.expires, 'secure': c.secure}
+            for c in self.session.cookies
+        ]
+        try:
+            fd = os.open(SESSION_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'id': self.id, 'saved_at': time.time(), 'cookies': cookies}, f)
+            os.chmod(SESSION_PATH, 0o600)
+        except Exception as e:
+            self.log(f"로그인 세션 저장 실패: {str(e)}")
+
+    def restore_session(self) -> bool:
+        """저장된 쿠키를 불러오고, 인증이 필요한 가벼운 요청 한 번으로 유효한지 확인합니다."""
+        if not os.path.exists(SESSION_PATH):
+            return False
+        try:
+            with open(SESSION_PATH, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get('id') != self.id:
+                return False
+
+            now = time.time()
+            for cookie in saved.get('cookies', []):
+                if cookie.get('expires') and cookie['expires'] < now:
+                    continue
+                self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''),
+                                         path=cookie.get('path', '/'), expires=cookie.get('expires'), secure=cookie.get('secure', False))
+            if not (self.session.cookies.get('NID_AUT') and self.session.cookies.get('NID_SES')):
+                return False
+
+            # 로그인 상태면 내 블로그로, 아니면 로그인 페이지로 리다이렉트됨
+            response = self.send_request('GET', self.BLOG_URL + self.SESSION_CHECK_PATH, allow_redirects=False)
+            location = response.headers.get('location', '')
+            if response.is_redirect and 'nid.naver.com' not in location:
+                return True
+
+            self.log("저장된 로그인 세션이 만료되었습니다.")
+        except Exception as e:
+            self.log(f"저장된 로그인 세션 확인 실패: {str(e)}")
+        self.session.cookies.clear()
+        return False
+
+    def create_session(self):
+        """모든 네이버 API 호출이 함께 쓰는 keep-alive 세션을 만듭니다."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['user-agent'] = self.headers['user-agent']
+        return session
+
+    def sync_cookies(self):
+        """웹드라이버의 로그인 쿠키를 공용 세션으로 복사합니다."""
+        if not self.driver:
+            return
+        for cookie in self.driver.get_cookies():
+            self.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+
+    def send_request(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """공용 세션으로 요청을 보내고, 인증 실패 시 쿠키를 다시 동기화합니다.
+
+        엔드포인트별 타임아웃을 쓰고, 일시적인 오류(5xx, 429, 연결 오류)는 지수 백오프로 재시도합니다.
+        연속으로 실패하는 엔드포인트는 CircuitBreaker가 잠시 멈춥니다.
+        idempotent를 주지 않으면 GET/HEAD만 멱등으로 봅니다. _method로 POST를 흉내 내는 GET은 False를 넘겨야 합니다.
+        """
+        path = urlsplit(url).path
+        endpoint = self.metrics.endpoint(url)
+        kwargs.setdefault('timeout', self.REQUEST_TIMEOUTS.get(path, self.REQUEST_TIMEOUT))
+        # 댓글 작성 같은 POST는 서버가 처리하지 않은 것이 확실할 때(429/503, 연결 자체 실패)만 재시도
+        if idempotent is None:
+            idempotent = method.upper() in ('GET', 'HEAD')
+        for attempt in range(self.MAX_RETRIES + 1):
+            self.wait_for_circuit(endpoint)
+            retry_after = None
+            try:
+                response = self.session.request(method, url, **kwargs)
+                if response.status_code in (401, 403) and self.reauthenticate():
+                    # 인증 실패 시에만 쿠키를 다시 동기화하고 한 번 재시도
+                    self.log("인증 오류가 발생하여 쿠키를 다시 동기화합니다.")
+                    self.metrics.add_request(url, response.status_code, 0)
+                    response.close()
+                    self.sync_cookies()
+                    response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                self.metrics.add_request(url, None, 0)
+                if not isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                    raise
+                self.record_endpoint_failure(endpoint)
+                if attempt == self.MAX_RETRIES or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise
+                reason = e.__class__.__name__
+            else:
+                status = response.status_code
+                if status < 500 and status != 429:
+                    self.circuit.record_success(endpoint)
+                    # 스트리밍 응답은 실제로 읽은 만큼 fetch_post_view에서 더함
+                    self.metrics.add_request(url, status, 0 if kwargs.get('stream') else len(response.content))
+                    return response
+                self.metrics.add_request(url, status, 0)
+                self.record_endpoint_failure(endpoint)
+                if attempt == self.MAX_RETRIES or not (idempotent or status in (429, 503)):
+                    return response
+                retry_after = self.parse_retry_after(response.headers.get('retry-after'))
+                response.close()
+                reason = f"HTTP {status}"
+            delay = self.backoff_delay(attempt)
+            if retry_after is not None:
+                if retry_after > self.RETRY_MAX_DELAY:
+                    # 오래 기다리라고 하면 이 엔드포인트 전체를 그동안 멈춤 (다음 시도에서 wait_for_circuit이 기다림)
+                    self.circuit.open(endpoint, min(retry_after, self.CIRCUIT_MAX_PAUSE))
+                    delay = 0
+                else:
+                    delay = max(delay, retry_after)
+            self.log(f"{endpoint} 요청 실패({reason}), {delay:.1f}초 후 다시 시도합니다. ({attempt + 1}/{self.MAX_RETRIES})")
+            with self.metrics.stage('backoff'):
+                if self.sleep(delay):
+                    raise requests.ConnectionError("작업이 중지되어 요청을 다시 보내지 않았습니다.")
+
+    def backoff_delay(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간, 지수적으로 늘리되 흩뜨림을 줌"""
+        delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt)
+        return random.uniform(delay / 2, delay)  # 여러 작업자가 같은 순간에 다시 몰리지 않도록 흩뜨림
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Retry-After 헤더(초 또는 HTTP 날짜)를 기다릴 초로 바꿉니다."""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def record_endpoint_failure(self, endpoint: str) -> None:
+        """일시적인 실패를 기록하고, 이번 실패로 엔드포인트가 멈췄으면 알립니다."""
+        if self.circuit.record_failure(endpoint):
+            self.log(f"{endpoint} 요청이 {self.CIRCUIT_FAILURE_THRESHOLD}번 연속 실패하여 {self.CIRCUIT_OPEN_SECONDS}초 동안 멈춥니다.")
+
+    def wait_for_circuit(self, endpoint: str) -> None:
+        """엔드포인트가 멈춘 상태면 다시 요청해도 될 때까지 기다립니다. 그동안 파이프라인의 해당 단계도 함께 멈춥니다."""
+        remaining = self.circuit.remaining(endpoint)
+        if not remaining:
+            return
+        self.log(f"{endpoint} 요청을 {remaining:.0f}초 동안 멈춘 상태입니다. 기다린 뒤 다시 시도합니다.")
+        with self.metrics.stage('circuit_open'):
+            if self.sleep(remaining):
+                raise requests.ConnectionError("작업이 중지되어 요청을 보내지 않았습니다.")
+
+    def reauthenticate(self) -> bool:
+        """인증 오류가 나면 로그인 상태를 되살립니다.
+
+        브라우저 없이 실행 중이고 세션이 만료되었으면 크롬을 띄워 다시 로그인합니다.
+        세션이 유효하면(로그인과 무관한 403) False를 돌려 원래 응답을 그대로 쓰게 합니다.
+        """
+        with self.login_lock:
+            if self.session_expired:
+                return False
+            if self.driver:
+                return True
+            # 세션이 아직 유효하면 로그인 문제가 아닌 403(권한 없음 등)이므로 그대로 돌려줌
+            response = self.session.request('GET', self.BLOG_URL + self.SESSION_CHECK_PATH, allow_redirects=False, timeout=self.REQUEST_TIMEOUT)
+            if response.is_redirect and 'nid.naver.com' not in response.headers.get('location', ''):
+                return False
+            self.log("저장된 로그인 세션이 만료되어 브라우저로 다시 로그인합니다.")
+            self.initialize_driver()
+            if self.login():
+                self.save_session()
+                return True
+            self.session_expired = True
+            self.log("다시 로그인하지 못했습니다. 남은 작업을 중단합니다.")
+            return False
+
+    def wait_random_time(self, min_seconds: float, max_seconds: float):
+        """랜덤 대기 시간 설정"""
+        with self.metrics.stage('pacing'):
+            self.sleep(random.uniform(min_seconds, max_seconds))
+
+    def discover_posts(self, posts_queue: queue.Queue, stop_event: threading.Event) -> None:
+        """이웃새글을 페이지 순서대로 읽어 포스트마다 읽기 작업을 걸어 두고 큐에 넣습니다.
+
+        큐가 가득 차면 작성 쪽이 따라올 때까지 기다리므로 PIPELINE_DEPTH개 이상 앞서가지 않습니다.
+        """
+        # 피드가 밀리면 같은 포스트가 다음 페이지에 다시 나오므로 한 실행에서 한 번만 큐에 넣음
+        seen = set()
+        try:
+            # 이어서 실행이면 체크포인트에 남은 포스트를 다시 수집/확인하지 않고 먼저 넣음
+            for page, items in self.restore_pending_items():
+                seen.update((item['blog_id'], item['blog_post_id']) for item in items)
+                for item in items:
+                    if not self.put_until_stopped(posts_queue, item, stop_event):
+                        return
+                if not self.put_until_stopped(posts_queue, {'page_done': page}, stop_event):
+                    return
+
+            if self.checkpoint.feed_exhausted:
+                return
+            for page in range(max(self.start_page, self.checkpoint.discovered_page + 1), self.end_page + 1):
+                if stop_event.is_set() or self.session_expired:
+                    return
+
+                self.log(f"\n{page}페이지 이웃새글 목록을 불러옵니다.")
+                neighbor_blogs = self.get_neighbor_blogs(page)
+                if neighbor_blogs is None:
+                    self.log(f"{page}페이지의 이웃 블로그 목록을 가져오는데 실패했습니다.")
+                    return
+                if not neighbor_blogs:
+                    # 피드 끝까지 읽었으므로 남은 포스트만 처리하면 실행이 끝난 것으로 봄
+                    self.log(f"{page}페이지에 이웃새글이 없어 수집을 마칩니다.")
+                    if not self.checkpoint.mark_exhausted():
+                        self.log("체크포인트 저장 실패")
+                    return
+                self.log(f"총 {len(neighbor_blogs)}개의 이웃 블로그를 찾았습니다.")
+                neighbor_blogs = [post for post in neighbor_blogs if post not in seen]
+                seen.update(neighbor_blogs)
+
+                # 아직 좋아요하지 않은 포스트의 공감 여부와 토큰을 한 번에 조회
+                records = {post: self.ledger.get(*post) or {} for post in neighbor_blogs}
+                like_targets = [post for post in neighbor_blogs if not records[post].get('liked_at')]
+                like_states = self.get_like_states(like_targets) if like_targets else {}
+
+                items = []
+                for post in neighbor_blogs:
+                    record = records[post]
+                    # 댓글을 쓸 포스트는 작성 차례가 오기 전에 blogNo/댓글 확인/본문/Gemini 댓글을 미리 준비
+                    prepared = None
+                    if not record.get('commented_at'):
+                        prepared = self.enrich_executor.submit(self.profiled(self.prepare_comment), *post)
+                    items.append({'page': page, 'blog_id': post[0], 'blog_post_id': post[1], 'record': record, 'like_state': like_states.get(post), 'prepared': prepared})
+
+                # 큐에 넣기 전에 페이지 전체를 체크포인트에 남겨 두어 중단되어도 이 페이지를 다시 수집하지 않음
+                if not self.checkpoint.add(items, discovered_page=page):
+                    self.log("체크포인트 저장 실패")
+                for item in items:
+                    if not self.put_until_stopped(posts_queue, item, stop_event):
+                        return
+
+                if not self.put_until_stopped(posts_queue, {'page_done': page}, stop_event):
+                    return
+
+        except Exception as e:
+            self.log(f"이웃새글 수집 중 오류 발생: {str(e)}")
+        finally:
+            # 작성 쪽에 수집이 끝났음을 알림
+            self.put_until_stopped(posts_queue, None, stop_event)
+
+    def restore_pending_items(self) -> List[Tuple[int, List[Dict]]]:
+        """체크포인트에 남은 포스트를 페이지별 작업 항목으로 되돌립니다.
+
+        처리 여부는 장부에서 다시 읽으므로 좋아요만 하고 중단된 포스트는 댓글만 씁니다.
+        준비해 둔 댓글 확인/생성 결과는 그대로 쓰고, 없으면 다시 준비합니다.
+        """
+        pages = OrderedDict()
+        for saved in list(self.checkpoint.pending.values()):
+            post = (saved['blog_id'], saved['blog_post_id'])
+            record = self.ledger.get(*post) or {}
+            prepared = None
+            if not record.get('commented_at'):
+                if saved.get('prepared'):
+                    prepared = Future()
+                    prepared.set_result(saved['prepared'])
+                else:
+                    prepared = self.enrich_executor.submit(self.profiled(self.prepare_comment), *post)
+            pages.setdefault(saved['page'], []).append(dict(saved, record=record, prepared=prepared))
+
+        for items in pages.values():
+            self.checkpoint.add(items)
+        return list(pages.items())
+
+    def mark_checkpoint_done(self, item: Dict) -> None:
+        """처리한 포스트를 체크포인트에서 빼고 마지막으로 처리한 위치를 저장합니다."""
+        if not self.checkpoint.done(item):
+            self.log("체크포인트 저장 실패")
+
+    def put_until_stopped(self, posts_queue: queue.Queue, item, stop_event: threading.Event) -> bool:
+        """큐에 자리가 날 때까지 기다려 넣습니다. 그 사이 중지되면 False를 반환합니다."""
+        while not stop_event.is_set():
+            try:
+                posts_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def write_metrics(self):
+        """단계별 p50/p95를 출력하고 실행 요약을 METRICS_DIR에 저장합니다."""
+        summary = self.metrics.summary()
+        self.log(f"\n=== 실행 통계 (요청 {summary['total_requests']}회, {summary['total_bytes'] / 1024:.0f}KB) ===")
+        for name, stats in summary['stages'].items():
+            self.log(f"{name}: {stats['count']}회, p50 {stats['p50']:.2f}초, p95 {stats['p95']:.2f}초")
+        try:
+            path = self.metrics.write(METRICS_DIR, self.prometheus_textfile)
+            self.log(f"실행 통계를 저장했습니다: {path}")
+        except OSError as e:
+            self.log(f"실행 통계 저장 실패: {str(e)}")
+
+    def read_cbox_token_ttl(self) -> float:
+        """AUTO_REPLY_CBOX_TOKEN_TTL(초)을 읽습니다. 없거나 숫자가 아니면 CBOX_TOKEN_TTL을 씁니다."""
+        value = os.getenv('AUTO_REPLY_CBOX_TOKEN_TTL')
+        try:
+            return float(value) if value else self.CBOX_TOKEN_TTL
+        except ValueError:
+            return self.CBOX_TOKEN_TTL
+
+    def get_cbox_token(self, blog_id: str, blog_post_id: str, blog_no: str) -> Tuple[Optional[str], bool]:
+        """댓글 작성을 위한 cbox_token을 가져옵니다.
+
+        TTL 안에 받은 토큰이 있으면 같은 포스트이거나 포스트별 토큰으로 확인되지 않은 한 그대로 씁니다.
+        범위를 아직 모르면 다른 포스트에도 써 보고, 서버가 거절하는지로 write_comment가 범위를 판단합니다.
+        (토큰, 캐시에서 꺼냈는지 여부)를 반환합니다.
+        """
+        object_id = f'{blog_no}_201_{blog_post_id}'
+        cached = self.cbox_token
+        if cached and time.time() - cached['fetched_at'] < self.cbox_token_ttl:
+            if cached['object_id'] == object_id or not self.cbox_token_per_object:
+                return cached['token'], True
+
+        try:
+            url = f"{self.APIS_URL}/commentBox/cbox/web_naver_token_jsonp.json"
+            params = {
+                'ticket': 'blog',
+                'templateId': 'default',
+                'pool': 'blogid',
+                'lang': 'ko',
+                'country': '',
+                'objectId': object_id,
+                '_cv': '20240923174033',
+                'categoryId': '',
+                'groupId': f'{blog_no}',
+            }
+
+            headers = {
+                'accept': '*/*',
+                'accept-encoding': 'gzip, deflate, br, zstd',
+                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+                'referer': 'https://m.blog.naver.com/CommentList.naver',
+                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
+                'sec-ch-ua-mobile': '?0',
+                'sec-ch-ua-platform': '"Windows"',
+                'sec-fetch-dest': 'script',
+                'sec-fetch-mode': 'no-cors',
+                'sec-fetch-site': 'same-site',
+                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+            }
+
+            with self.metrics.stage('cbox_token'):
+                response = self.send_request('GET', url, params=params, headers=headers)
+            response.raise_for_status()
+
+            token = response.json()['result']['cbox_token']
+
+        except Exception as e:
+            self.log(f"cbox_token 가져오기 실패: {str(e)}")
+            return None, False
+
+        self.cbox_token = {'token': token, 'object_id': object_id, 'fetched_at': time.time()}
+        return token, False
+
+    def invalidate_cbox_token(self):
+        """캐시된 cbox_token을 버립니다. 세션 단위로 판단했던 토큰이 거절되었으면 범위도 다시 측정하게 합니다."""
+        self.cbox_token = None
+        if self.cbox_token_per_object is False:
+            self.cbox_token_per_object = None
+
+    def is_cbox_token_error(self, response, result: Dict) -> bool:
+        """댓글 작성 실패가 인증/토큰 문제 때문인지 확인합니다."""
+        if response.status_code in (401, 403):
+            return True
+        message = f"{result.get('code', '')} {result.get('message', '')}".lower()
+        return any(word in message for word in ('token', '토큰', 'login', '로그인', '인증'))
+
+    def fetch_post_view(self, blog_id: str, blog_post_id: str, need_content: bool = True) -> Dict[str, Optional[str]]:
+        """PostView 페이지를 한 번만 받아 blogNo와 본문을 함께 추출하고 캐시합니다.
+
+        응답은 스트리밍으로 읽으면서 blogNo(와 need_content면 본문)를 찾는 즉시 연결을 닫습니다.
+        """
+        key = (blog_id, blog_post_id)
+        with self.post_view_lock:
+            cached = self.post_view_cache.get(key)
+            if cached and (cached['has_content'] or not need_content):
+                self.post_view_cache.move_to_end(key)
+                return cached
+
+        url = f'{self.BLOG_URL}/PostView.naver?blogId={blog_id}&logNo={blog_post_id}'
+        started = time.perf_counter()
+        received = 0
+        response = self.send_request('GET', url, stream=True)
+        try:
+            response.raise_for_status()
+
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            extractor = PostTextExtractor(self.POST_TEXT_LIMIT)
+            blog_no = None
+            tail = ''
+            for chunk in response.iter_content(chunk_size=16384):
+                received += len(chunk)
+                text = decoder.decode(chunk)
+
+                # blogNo 할당문이 청크 경계에 걸칠 수 있어 이전 청크의 끝부분과 이어서 검색
+                if blog_no is None:
+                    match = self.BLOG_NO_PATTERN.search(tail + text)
+                    if match:
+                        blog_no = match.group(1)
+                    tail = (tail + text)[-64:]
+
+                # 블로그 내용 추출: 본문 컨테이너의 텍스트만 모으고 충분히 모이면 나머지는 읽지 않음
+                if need_content and not extractor.done:
+                    extractor.feed(text)
+
+                if blog_no and (not need_content or extractor.done):
+                    break
+        finally:
+            response.close()
+            self.metrics.add_bytes(url, received)
+            self.metrics.add_timing('post_view', time.perf_counter() - started)
+
+        post_view = {
+            'blog_no': blog_no,
+            'content': extractor.text if need_content else None,
+            'has_content': need_content
+        }
+
+        # blogNo를 찾지 못한 결과는 캐시하지 않아 다음 조회에서 다시 받아 봄
+        if not post_view['blog_no']:
+            return post_view
+        self.blog_no_index.set(blog_id, post_view['blog_no'])
+
+        with self.post_view_lock:
+            self.post_view_cache[key] = post_view
+            if len(self.post_view_cache) > self.POST_VIEW_CACHE_SIZE:
+                self.post_view_cache.popitem(last=False)
+        return post_view
+
+    def get_blog_no(self, blog_id: str, blog_post_id: str) -> Optional[str]:
+        """블로그 번호를 가져옵니다. 한 번 찾은 번호는 로컬 인덱스에서 바로 돌려줍니다.
+
+        Gemini 댓글을 쓸 때는 같은 다운로드에서 본문도 함께 추출해 캐시해 둡니다.
+        """
+        blog_no = self.blog_no_index.get(blog_id)
+        if blog_no:
+            return blog_no
+
+        try:
+            return self.fetch_post_view(blog_id, blog_post_id, need_content=self.use_gemini)['blog_no']
+
+        except Exception as e:
+            self.log(f"블로그 번호 가져오기 실패: {str(e)}")
+            return None
+
+    def get_blog_content(self, blog_id: str, blog_post_id: str) -> Optional[str]:
+        """블로그 포스트의 내용을 가져옵니다."""
+        try:
+            return self.fetch_post_view(blog_id, blog_post_id)['content']
+
+        except Exception as e:
+            self.log(f"블로그 내용 가져오기 실패: {str(e)}")
+            return None
+
+    def generate_comment_with_gemini(self, blog_content: str) -> Optional[str]:
+        """Gemini API를 사용하여 블로그 내용에 맞는 댓글을 생성합니다."""
+        try:
+            prompt = f"""
+            다음 블로그 글을 읽고 적절한 댓글을 작성해주세요.
+            댓글은 1-2문장으로 간단하게 작성하고, 블로그 내용을 잘 이해했다는 것을 보여주면서
+            긍정적이고 격려하는 톤으로 작성해주세요.
+
+            블로그 내용:
+            {blog_content}
+            """
+
+            # 같은 본문과 프롬프트로 이미 만든 댓글이 있으면 API를 호출하지 않고 재사용
+            cache_key = hashlib.sha256(f"{self.PROMPT_VERSION}\n{blog_content}".encode('utf-8')).hexdigest()
+            cached_comment = self.comment_cache.get(cache_key)
+            if cached_comment:
+                self.log("캐시된 Gemini 댓글을 재사용합니다.")
+                return cached_comment
+
+            with self.metrics.stage('gemini'):
+                response = self.run_with_timeout(self.model.generate_content, prompt, timeout=self.GEMINI_TIMEOUT)
+            self.comment_cache.put(cache_key, response.text)
+            return response.text
+
+        except Exception as e:
+            self.log(f"Gemini 댓글 생성 실패: {str(e)}")
+            return None
+
+    def is_own_comment(self, comment: dict) -> bool:
+        """댓글이 내 댓글인지 확인합니다. 닉네임보다 응답의 사용자 식별자를 우선합니다."""
+        if 'mine' in comment:
+            if comment['mine'] and comment.get('userIdNo'):
+                self.user_id_no = comment['userIdNo']
+            return bool(comment['mine'])
+        if self.user_id_no and comment.get('userIdNo'):
+            return comment['userIdNo'] == self.user_id_no
+        return comment.get('userName') == self.nickname
+
+    @timed('comment_check')
+    def has_commented(self, blog_id: str, blog_post_id: str) -> bool:
+        """이미 댓글을 작성했는지 확인합니다."""
+        try:
+            # 블로그 번호 가져오기
+            blog_Num = self.get_blog_no(blog_id, blog_post_id)
+            if not blog_Num:
+                self.log("블로그 번호를 가져오지 못했습니다.")
+                return False
+
+            url = f"{self.APIS_URL}/commentBox/cbox/web_naver_list_json.json"
+            params = {
+                'ticket': 'blog',
+                'templateId': 'default',
+                'pool': 'blogid',
+                'lang': 'ko',
+                'country': '',
+                'objectId': f'{blog_Num}_201_{blog_post_id}',
+                'categoryId': '',
+                'pageSize': str(self.COMMENT_PAGE_SIZE),
+                'indexSize': '10',
+                'groupId': blog_Num,
+                'listType': 'OBJECT',
+                'pageType': 'more',
+                'objectUrl': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
+                '_cv': str(int(time.time() * 1000))
+            }
+
+            headers = {
+                'accept': 'application/json, text/javascript, */*; q=0.01',
+                'accept-encoding': 'gzip, deflate, br, zstd',
+                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+                'referer': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
+                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
+                'sec-ch-ua-mobile': '?0',
+                'sec-ch-ua-platform': '"Windows"',
+                'sec-fetch-dest': 'empty',
+                'sec-fetch-mode': 'cors',
+                'sec-fetch-site': 'same-site',
+                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+            }
+
+            # 작은 페이지 단위로 조회하다가 내 댓글을 찾거나 목록이 끝나면 중단
+            for page in range(1, self.COMMENT_SCAN_MAX_PAGES + 1):
+                params['page'] = str(page)
+                response = self.send_request('GET', url, params=params, headers=headers)
+                result = response.json().get('result') or {}
+                comments = result.get('commentList') or []
+
+                for comment in comments:
+                    if self.is_own_comment(comment):
+                        self.log(f"이미 '{self.nickname}' 님이 댓글을 작성하셨습니다.")
+                        self.ledger.mark_commented(blog_id, blog_post_id, 'already')
+                        return True
+
+                total_pages = (result.get('pageModel') or {}).get('totalPages')
+                if len(comments) < self.COMMENT_PAGE_SIZE or (total_pages and page >= total_pages):
+                    break
+
+            return False
+
+        except Exception as e:
+            self.log(f"댓글 목록 확인 중 오류 발생: {str(e)}")
+            return False
+
+    def prepare_comment(self, blog_id: str, blog_post_id: str) -> Dict[str, object]:
+        """백그라운드에서 댓글 작성 여부를 확인하고 Gemini 댓글을 생성합니다."""
+        if self.has_commented(blog_id, blog_post_id):
+            return {'already_commented': True, 'comment': None}
+
+        # 템플릿 댓글은 작성할 때 고름 (blogNo는 댓글 확인에서 이미 받아 둠)
+        if not self.use_gemini:
+            return {'already_commented': False, 'comment': None}
+
+        blog_content = self.get_blog_content(blog_id, blog_post_id)
+        if not blog_content:
+            self.log(f"블로그 내용을 가져오지 못했습니다. ({blog_id}/{blog_post_id})")
+            return {'already_commented': False, 'comment': None}
+        return {'already_commented': False, 'comment': self.generate_comment_with_gemini(blog_content)}
+
+    @timed('comment')
+    def write_comment(self, blog_id: str, blog_post_id: str, prepared: Optional[Dict] = None) -> bool:
+        """블로그에 댓글을 작성합니다. prepared는 prepare_comment의 결과이며, 없으면 여기서 확인/생성합니다."""
+        try:
+            # 이미 댓글을 작성했는지 확인
+            already_commented = prepared['already_commented'] if prepared else self.has_commented(blog_id, blog_post_id)
+            if already_commented:
+                self.log("이미 댓글을 작성한 포스트입니다.")
+                return False
+
+            # 댓글 내용 생성
+            if self.use_gemini and prepared:
+                comment_content = prepared['comment']
+                if not comment_content:
+                    self.log("댓글 생성에 실패했습니다.")
+                    return False
+            elif self.use_gemini:
+                # Gemini API로 댓글 생성
+                blog_content = self.get_blog_content(blog_id, blog_post_id)
+                if not blog_content:
+                    self.log("블로그 내용을 가져오지 못했습니다.")
+                    return False
+
+                comment_content = self.generate_comment_with_gemini(blog_content)
+                if not comment_content:
+                    self.log("댓글 생성에 실패했습니다.")
+                    return False
+            else:
+                # 템플릿 댓글 사용
+                comment_content = self.comment_templates[self.current_template_index]
+                self.current_template_index = (self.current_template_index + 1) % len(self.comment_templates)
+
+            # 댓글 작성 API 호출
+            blog_Num = self.get_blog_no(blog_id, blog_post_id)
+            if not blog_Num:
+                self.log("블로그 번호를 가져오지 못했습니다.")
+                return False
+
+            cbox_token, token_cached = self.get_cbox_token(blog_id, blog_post_id, blog_Num)
+            if not cbox_token:
+                self.log("cbox_token을 가져오지 못했습니다.")
+                return False
+            # 다른 포스트용으로 받은 토큰을 범위를 모르는 채로 쓰면, 이번 작성 결과로 포스트별 토큰인지 판단
+            measuring = token_cached and self.cbox_token_per_object is None and self.cbox_token['object_id'] != f'{blog_Num}_201_{blog_post_id}'
+
+            url = f"{self.APIS_URL}/commentBox/cbox/web_naver_create_json.json"
+            params = {
+                'ticket': 'blog',
+                'templateId': 'default',
+                'pool': 'blogid',
+                '_cv': str(int(time.time() * 1000))
+            }
+
+            data = {
+                'lang': 'ko',
+                'country': '',
+                'objectId': f'{blog_Num}_201_{blog_post_id}',
+                'categoryId': '',
+                'pageSize': '100',
+                'indexSize': '10',
+                'groupId': f'{blog_Num}',
+                'listType': 'OBJECT',
+                'pageType': 'more',
+                'objectUrl': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
+                'contents': comment_content,
+                'userType': '',
+                'pick': 'false',
+                'manager': 'false',
+                'score': '0',
+                'sort': 'NEW',
+                'secret': 'false',
+                'refresh': 'false',
+                'imageCount': '0',
+                'commentType': 'txt',
+                'validateBanWords': 'false',
+                'cbox_token': cbox_token
+            }
+
+            headers = {
+                'accept': 'application/json, text/javascript, */*; q=0.01',
+                'accept-encoding': 'gzip, deflate, br, zstd',
+                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+                'origin': 'https://m.blog.naver.com',
+                'referer': f'https://m.blog.naver.com/CommentList.naver?blogId={blog_id}&logNo={blog_post_id}',
+                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
+                'sec-ch-ua-mobile': '?0',
+                'sec-ch-ua-platform': '"Windows"',
+                'sec-fetch-dest': 'empty',
+                'sec-fetch-mode': 'cors',
+                'sec-fetch-site': 'same-site',
+                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36',
+                'content-type': 'application/x-www-form-urlencoded'
+            }
+
+            with self.metrics.stage('write'):
+                response = self.send_request('POST', url, params=params, headers=headers, data=data)
+            result = self.parse_comment_result(response)
+
+            rejected = not result.get('success') and token_cached and self.is_cbox_token_error(response, result)
+            if measuring and (rejected or result.get('success')):
+                self.cbox_token_per_object = rejected
+                self.log(f"cbox_token 범위 측정: {'포스트별' if rejected else '세션 단위'}")
+
+            # 캐시에서 꺼낸 토큰이 거절되면 버리고 새로 받은 토큰으로 한 번만 다시 시도
+            if rejected:
+                self.log("캐시된 cbox_token이 거절되어 새로 받아 다시 시도합니다.")
+                self.invalidate_cbox_token()
+                cbox_token, _ = self.get_cbox_token(blog_id, blog_post_id, blog_Num)
+                if not cbox_token:
+                    self.log("cbox_token을 가져오지 못했습니다.")
+                    return False
+                data['cbox_token'] = cbox_token
+                params['_cv'] = str(int(time.time() * 1000))
+                with self.metrics.stage('write'):
+                    response = self.send_request('POST', url, params=params, headers=headers, data=data)
+                result = self.parse_comment_result(response)
+
+            if 'success' in result and result['success']:
+                self.log("댓글 작성 성공!")
+                # 작성한 댓글의 사용자 번호를 기억해 두고 이후 댓글 확인에 사용
+                written = (result.get('result') or {}).get('comment') or {}
+                if written.get('userIdNo'):
+                    self.user_id_no = written['userIdNo']
+                self.ledger.mark_commented(blog_id, blog_post_id, 'posted')
+                return True
+            else:
+                self.log("댓글 작성 실패")
+                return False
+
+        except Exception as e:
+            self.log(f"댓글 작성 중 오류 발생: {str(e)}")
+            return False
+
+    def parse_comment_result(self, response) -> Dict:
+        """댓글 작성 응답을 읽습니다. 인증 오류 등으로 JSON이 아니면 빈 결과로 봅니다."""
+        try:
+            return response.json()
+        except ValueError:
+            return {}
+
+    @timed('like_state')
+    def get_like_states(self, posts: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+        """여러 포스트의 공감 여부와 좋아요용 timestamp/guestToken을 한 번에 조회합니다.
+
+        q에 BLOG[blogId_logNo]를 |로 이어 LIKE_BATCH_SIZE개씩 묻고, timestamp/guestToken은 함께 조회한 포스트가 공유합니다.
+        응답에서 찾지 못한 포스트는 결과에서 빠지므로 like_post가 개별 조회로 대신합니다.
+        """
+        states = {}
+        url = f"{self.APIS_URL}/blogserver/like/v1/search/contents"
+        headers = {
+                'accept': '*/*',
+                'accept-encoding': 'gzip, deflate, br, zstd',
+                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+                'referer': 'https://m.blog.naver.com/PostView.naver',
+                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
+                'sec-ch-ua-mobile': '?0',
+                'sec-ch-ua-platform': '"Windows"',
+                'sec-fetch-dest': 'script',
+                'sec-fetch-mode': 'no-cors',
+                'sec-fetch-site': 'same-site',
+                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+            }
+
+        for start in range(0, len(posts), self.LIKE_BATCH_SIZE):
+            batch = posts[start:start + self.LIKE_BATCH_SIZE]
+            keys = {f'{blog_id}_{blog_post_id}': (blog_id, blog_post_id) for blog_id, blog_post_id in batch}
+            params = {
+                'suppress_response_codes': 'true',
+                'pool': 'blogid',
+                'q': '|'.join(f'BLOG[{content_id}]' for content_id in keys),
+                'isDuplication': 'true',
+                'cssIds': 'BASIC_MOBILE,BLOG_MOBILE',
+            }
+
+            try:
+                response = self.send_request('GET', url, params=params, headers=headers)
+                response.raise_for_status()
+                data = response.json()
+            except Exception as e:
+                self.log(f"좋아요 상태 조회 실패: {str(e)}")
+                continue
+
+            timestamp = data.get('timestamp')
+            guest_token = data.get('guestToken')
+            if not timestamp or not guest_token:
+                continue
+
+            for content in data.get('contents') or []:
+                key = keys.get(str(content.get('contentsId')))
+                if not key:
+                    continue
+                reactions = content.get('reactions') or []
+                is_reacted = bool(content.get('isReacted')) or any(reaction.get('isReacted') for reaction in reactions)
+                states[key] = {'is_reacted': is_reacted, 'timestamp': timestamp, 'guest_token': guest_token}
+
+            # 한 포스트만 조회했다면 공감 여부를 못 읽어도 토큰은 그 포스트 것이므로 그대로 사용 (공감 여부는 좋아요 응답으로 확인)
+            if len(batch) == 1 and batch[0] not in states:
+                states[batch[0]] = {'is_reacted': False, 'timestamp': timestamp, 'guest_token': guest_token}
+
+        return states
+
+    @timed('like')
+    def like_post(self, blog_id: str, blog_post_id: str, like_state: Optional[Dict] = None) -> bool:
+        """블로그 포스트에 좋아요를 누릅니다.
+
+        like_state는 페이지 단위로 미리 조회한 get_like_states 결과이며, 없으면 이 포스트만 조회합니다.
+        """
+        try:
+            batched = like_state is not None
+            if like_state is None:
+                self.log("\ntimestamp와 guestToken 가져오는 중...")
+                like_state = self.get_like_states([(blog_id, blog_post_id)]).get((blog_id, blog_post_id))
+                if not like_state:
+                    self.log("timestamp 또는 guestToken을 가져오지 못했습니다.")
+                    return False
+
+            if like_state['is_reacted']:
+                self.log("이미 이 포스트에 공감을 하셨습니다.")
+                self.ledger.mark_liked(blog_id, blog_post_id, 'already')
+                return True
+
+            timestamp = like_state['timestamp']
+            guest_token = like_state['guest_token']
+
+            # 좋아요 API URL
+            url = f"{self.APIS_URL}/blogserver/like/v1/services/BLOG/contents/{blog_id}_{blog_post_id}"
+            self.log(f"좋아요 API URL: {url}")
+
+            # 요청 파라미터
+            params = {
+                'suppress_response_codes': 'true',
+                '_method': 'POST',
+                'pool': 'blogid',
+                'displayId': 'BLOG',
+                'reactionType': 'like',
+                'categoryId': 'post',
+                'guestToken': guest_token,
+                'timestamp': timestamp,
+                '_ch': 'mbw',
+                'isDuplication': 'true',
+                'lang': 'ko',
+                'countType': 'DEFAULT',
+                'count': '1',
+                'history': '',
+                'runtimeStatus': '',
+                'isPostTimeline': 'false',
+                '_': timestamp
+            }
+
+            # 요청 헤더
+            headers = {
+                'accept': '*/*',
+                'accept-encoding': 'gzip, deflate, br, zstd',
+                'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+                'referer': 'https://m.blog.naver.com/PostView.naver',
+                'sec-ch-ua': '"Google Chrome";v="129", "Not=A?Brand";v="8", "Chromium";v="129"',
+                'sec-ch-ua-mobile': '?0',
+                'sec-ch-ua-platform': '"Windows"',
+                'sec-fetch-dest': 'script',
+                'sec-fetch-mode': 'no-cors',
+                'sec-fetch-site': 'same-site',
+                'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36'
+            }
+
+            # 좋아요 요청 보내기, _method=POST로 상태를 바꾸는 요청이므로 POST처럼 서버가 처리하지 않은 것이 확실할 때만 재시도
+            self.log("\n좋아요 요청 전송 중...")
+            response = self.send_request('GET', url, idempotent=False, params=params, headers=headers)
+            self.log(f"응답 상태 코드: {response.status_code}")
+
+            # 응답 확인
+            result = response.json()
+
+            # 응답 형식 확인
+            if 'statusCode' in result:
+                if result['statusCode'] == 200 or (result['statusCode'] == 409 and result['message'] == '이미 공감한 컨텐츠입니다.'):
+                    self.log(f"이미 이 포스트에 공감을 하셨습니다.")
+                    self.ledger.mark_liked(blog_id, blog_post_id, 'already')
+                    return True
+                elif batched:
+                    # 페이지 단위로 받은 토큰이 그 사이 만료됐을 수 있으므로 이 포스트만 다시 조회해 한 번 더 시도
+                    self.log(f"좋아요 실패: {result.get('message', '알 수 없는 오류')}, 토큰을 새로 받아 다시 시도합니다.")
+                    return self.like_post(blog_id, blog_post_id)
+                else:
+                    self.log(f"좋아요 실패: {result.get('message', '알 수 없는 오류')}")
+                    return False
+            elif 'isReacted' in result and result['isReacted']:
+                self.log(f"좋아요 성공! 현재 좋아요 수: {result['count']}")
+                self.ledger.mark_liked(blog_id, blog_post_id, 'liked')
+                return True
+            else:
+                self.log("좋아요 실패: 응답 형식이 예상과 다릅니다.")
+                return False
+
+        except Exception as e:
+            self.log(f"좋아요 실패: {str(e)}")
+            self.log(f"상세 오류: {e.__class__.__name__}")
+            return False
+
+    @timed('feed')
+    def get_neighbor_blogs(self, page: int = 1) -> Optional[List[Tuple[str, str]]]:
+        """이웃새글 목록을 가져옵니다. HTTP 피드를 우선 사용하고 실패하면 브라우저로 가져옵니다.
+
+        빈 목록은 피드에 더 이상 글이 없다는 뜻이므로 브라우저로 다시 시도하지 않습니다.
+        브라우저 없이 실행 중이면 피드를 읽으려고 크롬을 띄우지 않고, 가져오지 못했으면 None을 돌려줍니다.
+        """
+        if self.use_http_feed:
+            try:
+                blog_links = self.fetch_neighbor_feed(page)
+                self.log(f"\n이웃새글 {len(blog_links)}개를 찾았습니다. (HTTP 피드)")
+                return blog_links
+            except Exception as e:
+                if self.browserless and not self.driver:
+                    self.log(f"HTTP 피드 조회 실패, 브라우저 없이 실행 중이라 이웃새글 수집을 멈춥니다: {str(e)}")
+                    return None
+                self.log(f"HTTP 피드 조회 실패, 브라우저로 다시 시도합니다: {str(e)}")
+
+        return self.get_neighbor_blogs_from_browser(page)
+
+    def fetch_neighbor_feed(self, page: int) -> List[Tuple[str, str]]:
+        """BlogHome 화면이 사용하는 이웃새글 JSON API를 로그인 쿠키로 직접 호출합니다."""
+        headers = {
+            'accept': 'application/json, text/plain, */*',
+            'accept-language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+            'referer': f'https://section.blog.naver.com/BlogHome.naver?directoryNo=0&currentPage={page}&groupId=0',
+        }
+        response = self.send_request('GET', self.SECTION_URL + self.FEED_PATH, params={'page': page, 'groupId': 0}, headers=headers)
+        response.raise_for_status()
+
+        # 응답 앞에 붙는 JSON 하이재킹 방지 접두어 제거
+        text = response.text
+        if text.startswith(")]}'"):
+            text = text.split('\n', 1)[1] if '\n' in text else text[4:]
+        # 형식이 다른 응답(로그인 페이지 등)은 빈 피드로 보지 않고 오류로 올려 브라우저로 다시 시도하게 함
+        result = json.loads(text).get('result')
+        if not isinstance(result, dict) or not isinstance(result.get('buddyPostList', []), list):
+            raise ValueError("이웃새글 응답 형식을 알 수 없습니다.")
+        posts = result.get('buddyPostList') or []
+
+        blog_links = []
+        for post in posts:
+            blog_id = post.get('blogId') or post.get('domainIdOrBlogId')
+            log_no = post.get('logNo')
+            if not (blog_id and log_no):
+                match = re.search(r'blog\.naver\.com/([^/?]+)/(\d+)', post.get('postUrl') or '')
+                if not match:
+                    continue
+                blog_id, log_no = match.groups()
+            if (str(blog_id), str(log_no)) not in blog_links:
+                blog_links.append((str(blog_id), str(log_no)))
+
+        # 최대 10개로 제한
+        return blog_links[:10]
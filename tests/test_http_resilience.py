@@ -0,0 +1,161 @@
+import email.utils
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import naver_core
+from naver_core import CircuitBreaker, NaverClient
+
+URL = 'https://blog.naver.com/PostView.naver'
+
+
+def make_response(status: int, headers=None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b''
+    response._content_consumed = True
+    response.headers.update(headers or {})
+    response.url = URL
+    return response
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(NaverClient.parse_retry_after('5'), 5.0)
+        self.assertEqual(NaverClient.parse_retry_after('-3'), 0.0)
+
+    def test_http_date(self):
+        value = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(NaverClient.parse_retry_after(value), 30, delta=2)
+
+    def test_date_in_the_past(self):
+        self.assertEqual(NaverClient.parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+
+    def test_missing_or_invalid(self):
+        for value in (None, '', 'soon'):
+            with self.subTest(value=value):
+                self.assertIsNone(NaverClient.parse_retry_after(value))
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('naver_core.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.circuit = CircuitBreaker(failure_threshold=3, open_seconds=60)
+
+    def test_opens_after_threshold(self):
+        self.assertFalse(self.circuit.record_failure('feed'))
+        self.assertFalse(self.circuit.record_failure('feed'))
+        self.assertEqual(self.circuit.remaining('feed'), 0)
+        self.assertTrue(self.circuit.record_failure('feed'))
+        self.assertEqual(self.circuit.remaining('feed'), 60)
+        self.assertEqual(self.circuit.remaining('comment'), 0)
+
+    def test_half_open_failure_reopens(self):
+        for _ in range(3):
+            self.circuit.record_failure('feed')
+        self.now += 61
+        self.assertEqual(self.circuit.remaining('feed'), 0)
+        # 멈춘 시간이 지난 뒤 첫 요청이 실패하면 바로 다시 멈춤
+        self.assertTrue(self.circuit.record_failure('feed'))
+        self.assertEqual(self.circuit.remaining('feed'), 60)
+
+    def test_half_open_success_closes(self):
+        for _ in range(3):
+            self.circuit.record_failure('feed')
+        self.now += 61
+        self.circuit.record_success('feed')
+        self.assertEqual(self.circuit.remaining('feed'), 0)
+        self.assertFalse(self.circuit.record_failure('feed'))
+        self.assertFalse(self.circuit.record_failure('feed'))
+
+
+class SendRequestTest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        for name in ('DB_PATH', 'SESSION_PATH', 'METRICS_DIR', 'CHECKPOINT_PATH'):
+            patcher = mock.patch.object(naver_core, name, os.path.join(self.temp_dir, name.lower()))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.bot = NaverClient('test', 'test', 'test', False, 1, 1, log_callback=lambda msg: None)
+        self.addCleanup(self.close_bot)
+        self.bot.sleep = mock.Mock(return_value=False)
+        self.bot.session.request = mock.Mock()
+
+    def close_bot(self):
+        self.bot.session.close()
+        self.bot.ledger.conn.close()
+        self.bot.blog_no_index.conn.close()
+        self.bot.comment_cache.conn.close()
+
+    def test_backoff_delay_grows_and_is_capped(self):
+        for attempt in range(8):
+            delay = min(self.bot.RETRY_MAX_DELAY, self.bot.RETRY_BASE_DELAY * 2 ** attempt)
+            with self.subTest(attempt=attempt):
+                self.assertTrue(delay / 2 <= self.bot.backoff_delay(attempt) <= delay)
+
+    def test_get_retries_server_errors(self):
+        self.bot.session.request.return_value = make_response(500)
+        response = self.bot.send_request('GET', URL)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(self.bot.session.request.call_count, self.bot.MAX_RETRIES + 1)
+
+    def test_get_succeeds_after_retry(self):
+        self.bot.session.request.side_effect = [make_response(503), requests.ConnectionError(), make_response(200)]
+        self.assertEqual(self.bot.send_request('GET', URL).status_code, 200)
+        self.assertEqual(self.bot.session.request.call_count, 3)
+        self.assertEqual(self.bot.circuit.remaining(self.bot.metrics.endpoint(URL)), 0)
+
+    def test_get_raises_after_retries(self):
+        self.bot.session.request.side_effect = requests.ReadTimeout()
+        with self.assertRaises(requests.ReadTimeout):
+            self.bot.send_request('GET', URL)
+        self.assertEqual(self.bot.session.request.call_count, self.bot.MAX_RETRIES + 1)
+
+    def test_post_is_not_retried_on_server_error(self):
+        self.bot.session.request.return_value = make_response(500)
+        self.assertEqual(self.bot.send_request('POST', URL).status_code, 500)
+        self.assertEqual(self.bot.session.request.call_count, 1)
+
+    def test_post_is_retried_on_429_and_503(self):
+        self.bot.session.request.side_effect = [make_response(429), make_response(503), make_response(200)]
+        self.assertEqual(self.bot.send_request('POST', URL).status_code, 200)
+        self.assertEqual(self.bot.session.request.call_count, 3)
+
+    def test_non_idempotent_get_is_not_retried_on_read_timeout(self):
+        self.bot.session.request.side_effect = requests.ReadTimeout()
+        with self.assertRaises(requests.ReadTimeout):
+            self.bot.send_request('GET', URL, idempotent=False)
+        self.assertEqual(self.bot.session.request.call_count, 1)
+
+    def test_non_idempotent_get_is_retried_on_connect_timeout(self):
+        self.bot.session.request.side_effect = [requests.ConnectTimeout(), make_response(200)]
+        self.assertEqual(self.bot.send_request('GET', URL, idempotent=False).status_code, 200)
+        self.assertEqual(self.bot.session.request.call_count, 2)
+
+    def test_retry_after_sets_delay(self):
+        self.bot.session.request.side_effect = [make_response(429, {'Retry-After': '7'}), make_response(200)]
+        self.bot.send_request('GET', URL)
+        self.assertGreaterEqual(self.bot.sleep.call_args[0][0], 7)
+
+    def test_long_retry_after_opens_circuit(self):
+        self.bot.session.request.side_effect = [make_response(503, {'Retry-After': '120'}), make_response(200)]
+        self.bot.send_request('GET', URL)
+        # 다음 시도 전에 엔드포인트가 멈춘 시간만큼 기다림
+        self.assertAlmostEqual(self.bot.sleep.call_args_list[-1][0][0], 120, delta=2)
+        self.assertEqual(self.bot.session.request.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from naver_core import PostTextExtractor
+
+
+def extract(html: str, limit: int = 2000):
+    parser = PostTextExtractor(limit)
+    parser.feed(html)
+    parser.close()
+    return parser.text
+
+
+class PostTextExtractorTest(unittest.TestCase):
+    def test_unclosed_tags_do_not_leak_past_container(self):
+        html = (
+            '<div class="se-main-container"><p>Hello <b>world</b><p>unclosed<li>item</div>'
+            '<div class="comment">COMMENT TEXT</div><div>footer</div>'
+        )
+        self.assertEqual(extract(html), 'Hello world unclosed item')
+
+    def test_stray_end_tag_does_not_close_container_early(self):
+        html = '<div class="se-main-container"><p>first</span></p><div><p>second</div>third</div><div>footer</div>'
+        self.assertEqual(extract(html), 'first second third')
+
+    def test_post_view_area_only_page(self):
+        html = (
+            '<html><head><script>var x = "script text";</script></head><body>'
+            '<div id="postViewArea"><p>old editor<br>body<td>cell</div>'
+            '<div id="commentArea">COMMENT TEXT</div></body></html>'
+        )
+        self.assertEqual(extract(html), 'old editor body cell')
+
+    def test_done_when_post_view_area_closes(self):
+        parser = PostTextExtractor(2000)
+        parser.feed('<div id="postViewArea"><div><p>old editor</div>')
+        self.assertFalse(parser.done)
+        parser.feed('body</div><div id="commentArea">')
+        self.assertTrue(parser.done)
+
+    def test_not_done_while_main_container_is_open(self):
+        parser = PostTextExtractor(5)
+        parser.feed('<div id="postViewArea"><div class="se-main-container"><p>ab</p>')
+        self.assertFalse(parser.done)
+        parser.feed('</div>')
+        self.assertTrue(parser.done)
+        self.assertEqual(parser.text, 'ab')
+
+    def test_limit(self):
+        html = '<div class="se-main-container"><p>' + 'a' * 50 + '</p></div>'
+        self.assertEqual(extract(html, limit=10), 'a' * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()